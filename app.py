@@ -8,6 +8,7 @@ from config import API_CONFIG
 from functools import lru_cache
 import json
 from datetime import datetime, timedelta
+from urllib.parse import urlencode
 
 # Add pagination configuration at the top of the file
 PAGINATION_CONFIG = {
@@ -111,14 +112,19 @@ def logout():
     st.session_state.clear()
     st.rerun()
 
-# Session Timeout Check
-def check_session_timeout():
-    if "last_activity" in st.session_state:
-        if time.time() - st.session_state.last_activity > API_CONFIG['SESSION_TIMEOUT']:
-            st.session_state.authenticated = False
-            st.warning("Session expired. Please login again.")
-            st.rerun()
-    st.session_state.last_activity = time.time()
+# Session Timeout Check. Fragments rerun on their own, without the rest of
+# the page, so each one calls this first; an expired or logged out session
+# reruns the whole app to show the login page. Timed refreshes are not
+# operator activity and must not keep the session alive.
+def check_session_timeout(activity=True):
+    last_activity = st.session_state.get("last_activity", time.time())
+    if time.time() - last_activity > API_CONFIG['SESSION_TIMEOUT']:
+        st.session_state.authenticated = False
+        st.warning("Session expired. Please login again.")
+    if not st.session_state.get("authenticated"):
+        st.rerun(scope="app")
+    if activity:
+        st.session_state.last_activity = time.time()
 
 # Login Page with improved UI
 def login_page():
@@ -154,14 +160,16 @@ def format_bytes(size):
         n += 1
     return f"{size:.2f} {power_labels[n]}"
 
-def get_system_stats():
+def get_system_stats(fields=None):
     max_retries = 3
     retry_delay = 1  # seconds
+    params = {"fields": ",".join(fields)} if fields else None
     
     for attempt in range(max_retries):
         try:
             response = requests.get(
                 f"{API_CONFIG['FLASK_API_URL']}/system_stats",
+                params=params,
                 timeout=API_CONFIG['TIMEOUT']
             )
             
@@ -199,6 +207,548 @@ def get_system_stats():
     
     return None
 
+def get_top_processes(by="cpu", n=15):
+    try:
+        response = requests.get(
+            f"{API_CONFIG['FLASK_API_URL']}/processes/top",
+            params={"by": by, "n": n},
+            timeout=API_CONFIG['TIMEOUT']
+        )
+        if response.status_code == 200:
+            return response.json()
+        st.error(f"Server returned status code: {response.status_code}")
+    except requests.exceptions.ConnectionError:
+        st.error("Could not connect to the server. Please ensure the server is running.")
+    except Exception as e:
+        st.error(f"Error fetching top processes: {str(e)}")
+    return None
+
+def get_session_changes(since, epoch=None):
+    try:
+        response = requests.get(
+            f"{API_CONFIG['FLASK_API_URL']}/active_users/changes",
+            params={"since": since, "epoch": epoch},
+            timeout=API_CONFIG['TIMEOUT']
+        )
+        if response.status_code == 200:
+            return response.json()
+        st.error(f"Server returned status code: {response.status_code}")
+    except requests.exceptions.ConnectionError:
+        st.error("Could not connect to the server. Please ensure the server is running.")
+    except Exception as e:
+        st.error(f"Error fetching session changes: {str(e)}")
+    return None
+
+def get_alerts(since=0):
+    try:
+        response = requests.get(
+            f"{API_CONFIG['FLASK_API_URL']}/alerts",
+            params={"since": since},
+            timeout=API_CONFIG['TIMEOUT']
+        )
+        if response.status_code == 200:
+            return response.json()
+        st.error(f"Server returned status code: {response.status_code}")
+    except requests.exceptions.ConnectionError:
+        st.error("Could not connect to the server. Please ensure the server is running.")
+    except Exception as e:
+        st.error(f"Error fetching alerts: {str(e)}")
+    return None
+
+def get_logon_summary(inactive_days=90, days=30):
+    try:
+        response = requests.get(
+            f"{API_CONFIG['FLASK_API_URL']}/logs/summary",
+            params={"days": days, "inactive_days": inactive_days},
+            timeout=API_CONFIG['TIMEOUT']
+        )
+        if response.status_code == 200:
+            return response.json()
+        st.error(f"Server returned status code: {response.status_code}")
+    except requests.exceptions.ConnectionError:
+        st.error("Could not connect to the server. Please ensure the server is running.")
+    except Exception as e:
+        st.error(f"Error fetching account activity: {str(e)}")
+    return None
+
+def get_stats_history(window, points=300):
+    try:
+        response = requests.get(
+            f"{API_CONFIG['FLASK_API_URL']}/system_stats/history",
+            params={"window": window, "points": points},
+            timeout=API_CONFIG['TIMEOUT']
+        )
+        if response.status_code == 200:
+            return response.json()
+        st.error(f"Server returned status code: {response.status_code}")
+    except requests.exceptions.ConnectionError:
+        st.error("Could not connect to the server. Please ensure the server is running.")
+    except Exception as e:
+        st.error(f"Error fetching stats history: {str(e)}")
+    return None
+
+# Dashboard panels. Each panel is a fragment, so its widgets rerun only the
+# panel itself and the System Monitor panels refresh on their own timers
+# instead of rerunning the whole page.
+@st.fragment
+def user_data_panel():
+    check_session_timeout()
+
+    st.markdown("### 📋 User Data")
+
+    # Fetch Users with loading state
+    if st.button("Fetch Users", key="fetch_users_btn"):
+        with st.spinner('Fetching users...'):
+            df = fetch_data("users", "users")
+            if df is not None:
+                # Add pagination controls
+                total_rows = len(df)
+                if total_rows > PAGINATION_CONFIG["max_rows"]:
+                    st.warning(f"Showing first {PAGINATION_CONFIG['max_rows']} rows out of {total_rows}")
+                    df = df.head(PAGINATION_CONFIG["max_rows"])
+
+                st.dataframe(
+                    df,
+                    use_container_width=True,
+                    height=PAGINATION_CONFIG["height"],
+                    hide_index=True
+                )
+            else:
+                st.warning("No users found or server error.")
+
+    # Fetch Active Users with loading state
+    if st.button("Fetch Active Users", key="fetch_active_users_btn"):
+        with st.spinner('Fetching active users...'):
+            df = fetch_data("active_users", "active_users")
+            if df is not None:
+                # Add pagination controls
+                total_rows = len(df)
+                if total_rows > PAGINATION_CONFIG["max_rows"]:
+                    st.warning(f"Showing first {PAGINATION_CONFIG['max_rows']} rows out of {total_rows}")
+                    df = df.head(PAGINATION_CONFIG["max_rows"])
+
+                st.dataframe(
+                    df,
+                    use_container_width=True,
+                    height=PAGINATION_CONFIG["height"],
+                    hide_index=True
+                )
+            else:
+                st.warning("No active users found or server error.")
+
+    # Server-side logon rollups: last logon per account and daily counts
+    st.markdown("### 💤 Account Activity")
+    inactive_days = st.number_input("Inactive after (days)", min_value=1, max_value=365,
+                                    value=90, key="inactive_days")
+    if st.button("Fetch Account Activity", key="fetch_summary_btn"):
+        with st.spinner('Fetching account activity...'):
+            summary = get_logon_summary(inactive_days)
+            if summary:
+                if summary.get("backfilling"):
+                    st.info("The server is still reading the event log history; these figures are partial.")
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.metric("Inactive Accounts", len(summary["inactive_accounts"]))
+                with col2:
+                    st.metric("Unknown", len(summary["unknown_accounts"]))
+                if summary["history_days"] < inactive_days:
+                    st.warning(f"The Security log only covers the last {summary['history_days']} days, "
+                               f"so accounts without a logon in that time are shown as unknown, not inactive.")
+                st.dataframe(pd.DataFrame(summary["accounts"]),
+                             use_container_width=True, hide_index=True)
+                if summary["by_day"]:
+                    st.bar_chart(pd.Series(summary["by_day"], name="Logons"))
+
+    # Logon/logoff changes since the last check
+    if st.button("Check Session Changes", key="session_changes_btn"):
+        with st.spinner('Checking for session changes...'):
+            since = st.session_state.get("sessions_version")
+            changes = get_session_changes(since or 0, st.session_state.get("sessions_epoch"))
+            if changes is not None:
+                st.session_state.sessions_version = changes["version"]
+                st.session_state.sessions_epoch = changes["epoch"]
+                if since is None or changes.get("reset"):
+                    # First check (or too far behind): everything is a current session, not a change
+                    current = changes["active_users"] if changes.get("reset") else changes["added"]
+                    if since is None:
+                        st.info("Now tracking session changes. Current sessions:")
+                    else:
+                        st.info("Session list resynchronized with the server.")
+                    if current:
+                        st.dataframe(pd.DataFrame(current),
+                                     use_container_width=True, hide_index=True)
+                elif changes["added"] or changes["removed"]:
+                    if changes["added"]:
+                        st.markdown("**Logged on**")
+                        st.dataframe(pd.DataFrame(changes["added"]),
+                                     use_container_width=True, hide_index=True)
+                    if changes["removed"]:
+                        st.markdown("**Logged off**")
+                        st.dataframe(pd.DataFrame(changes["removed"]),
+                                     use_container_width=True, hide_index=True)
+                else:
+                    st.info("No session changes since the last check.")
+
+@st.fragment
+def login_logs_panel():
+    check_session_timeout()
+
+    st.markdown("### 📊 Login Logs")
+
+    # Input fields with improved validation
+    username = st.text_input("Enter username to filter logs (leave empty for all users)", 
+                           key="logs_username",
+                           help="Leave empty to see all users' logs")
+
+    days = st.number_input("Days to look back", 
+                         min_value=1, 
+                         max_value=365, 
+                         value=30, 
+                         key="logs_days",
+                         help="Select how many days of logs to view")
+
+    if st.button("Fetch Login Logs", key="fetch_logs_btn"):
+        with st.spinner('Fetching login logs...'):
+            params = {}
+            if username:
+                params['username'] = username
+            params['days'] = days
+
+            df = fetch_data("logs", "logs", params)
+            if df is not None:
+                # Add pagination controls
+                total_rows = len(df)
+                if total_rows > PAGINATION_CONFIG["max_rows"]:
+                    st.warning(f"Showing first {PAGINATION_CONFIG['max_rows']} rows out of {total_rows}")
+                    df = df.head(PAGINATION_CONFIG["max_rows"])
+
+                st.dataframe(
+                    df,
+                    use_container_width=True,
+                    height=PAGINATION_CONFIG["height"],
+                    hide_index=True
+                )
+            else:
+                st.warning("No login logs found")
+
+    # Full export is streamed by the server straight to the browser
+    export_format = st.radio("Export format", ["csv", "parquet"], horizontal=True,
+                             key="logs_export_format", format_func=str.upper)
+    export_days = st.number_input("Days to export", min_value=1, max_value=365, value=365,
+                                  key="logs_export_days",
+                                  help="Independent of the filter above; defaults to the full year")
+    export_params = {"format": export_format, "days": export_days}
+    if username:
+        export_params['username'] = username
+    st.link_button(
+        "⬇️ Download Full Login History",
+        f"{API_CONFIG['FLASK_API_URL']}/logs/export?{urlencode(export_params)}"
+    )
+
+    st.markdown("### 🚨 Security Alerts")
+    if st.button("Fetch Alerts", key="fetch_alerts_btn"):
+        with st.spinner('Fetching alerts...'):
+            result = get_alerts()
+            alerts = result.get("alerts", []) if result else None
+            if result and result.get("backfilling"):
+                st.info("The server is still reading the event log history; more alerts may follow.")
+            if alerts:
+                df = pd.DataFrame(alerts).sort_values("id", ascending=False)
+                st.dataframe(
+                    df[["time", "last_time", "count", "severity", "rule", "username", "source", "message"]],
+                    use_container_width=True,
+                    height=PAGINATION_CONFIG["height"],
+                    hide_index=True
+                )
+            elif alerts is not None and not result.get("backfilling"):
+                st.success("No suspicious logon activity detected")
+
+@st.fragment
+def user_details_panel():
+    check_session_timeout()
+
+    st.subheader("User Details")
+
+    # User Details section with improved validation
+    username = st.text_input("Enter Username to Fetch Details", 
+                           key="user_details_username",
+                           help="Enter the username to view detailed information")
+
+    if st.button("Get User Info", key="get_user_info_btn") and username:
+        is_valid, error_msg = validate_username(username)
+        if is_valid:
+            with st.spinner('Fetching user details...'):
+                try:
+                    response = requests.get(
+                        f"{API_CONFIG['FLASK_API_URL']}/user/{username}",
+                        timeout=API_CONFIG['TIMEOUT']
+                    )
+                    if response.status_code == 200:
+                        data = response.json()
+                        if data and "error" not in data:
+                            st.json(data)
+                        else:
+                            st.warning(data.get("error", "User not found!"))
+                    else:
+                        st.error("Failed to fetch user details.")
+                except Exception as e:
+                    st.error(f"Error connecting to server: {e}")
+        else:
+            st.error(error_msg)
+
+    # Remove User section
+    st.markdown("### 🗑️ Remove User")
+    user_to_remove = st.text_input("Enter Username to Remove", 
+                                 key="remove_user_username")
+
+    if st.button("Remove User", key="remove_user_btn") and user_to_remove:
+        is_valid, error_msg = validate_username(user_to_remove)
+        if is_valid:
+            with st.spinner('Removing user...'):
+                try:
+                    response = requests.post(
+                        f"{API_CONFIG['FLASK_API_URL']}/remove_user",
+                        json={"username": user_to_remove},
+                        timeout=API_CONFIG['TIMEOUT']
+                    )
+                    if response.status_code == 200:
+                        result = response.json()
+                        if result.get("status") == "success":
+                            st.success(f"User '{user_to_remove}' removed successfully!")
+                        else:
+                            st.error(f"Failed to remove user: {result.get('message', 'Unknown error')}")
+                    else:
+                        st.error(f"Server error: {response.status_code}")
+                except Exception as e:
+                    st.error(f"Error connecting to server: {e}")
+        else:
+            st.error(error_msg)
+
+@st.fragment(run_every=5)
+def system_overview_panel():
+    check_session_timeout(activity=False)
+
+    st.markdown("### 🖥️ System Statistics")
+
+    # Only the headline sections
+    stats = get_system_stats(fields=["cpu", "memory", "disk"])
+    if not stats or "error" in stats:
+        st.error("Failed to fetch system statistics")
+        return
+
+    # System Overview
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        if "cpu" in stats and "percent" in stats["cpu"]:
+            st.metric("CPU Usage", f"{stats['cpu']['percent']}%")
+        else:
+            st.metric("CPU Usage", "N/A")
+    with col2:
+        if "memory" in stats and "percent" in stats["memory"]:
+            st.metric("Memory Usage", f"{stats['memory']['percent']}%")
+        else:
+            st.metric("Memory Usage", "N/A")
+    with col3:
+        if "disk" in stats and "percent" in stats["disk"]:
+            st.metric("Disk Usage", f"{stats['disk']['percent']}%")
+        else:
+            st.metric("Disk Usage", "N/A")
+
+    # CPU and Memory Charts
+    col1, col2 = st.columns(2)
+    with col1:
+        # CPU Usage Gauge
+        if "cpu" in stats and "percent" in stats["cpu"]:
+            fig_cpu = go.Figure(go.Indicator(
+                mode="gauge+number",
+                value=stats['cpu']['percent'],
+                title={'text': "CPU Usage"},
+                gauge={'axis': {'range': [0, 100]},
+                      'bar': {'color': "#4A90E2"}}
+            ))
+            st.plotly_chart(fig_cpu, use_container_width=True)
+        else:
+            st.warning("CPU usage data not available")
+
+    with col2:
+        # Memory Usage Gauge
+        if "memory" in stats and "percent" in stats["memory"]:
+            fig_mem = go.Figure(go.Indicator(
+                mode="gauge+number",
+                value=stats['memory']['percent'],
+                title={'text': "Memory Usage"},
+                gauge={'axis': {'range': [0, 100]},
+                      'bar': {'color': "#4A90E2"}}
+            ))
+            st.plotly_chart(fig_mem, use_container_width=True)
+        else:
+            st.warning("Memory usage data not available")
+
+@st.fragment(run_every=60)
+def system_details_panel():
+    check_session_timeout(activity=False)
+
+    stats = get_system_stats()
+    if not stats or "error" in stats:
+        st.error("Failed to fetch system statistics")
+        return
+
+    # Detailed System Information
+    st.markdown("### 📊 Detailed System Information")
+
+    # CPU Details
+    st.markdown("#### CPU")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        if "cpu" in stats and "count" in stats["cpu"]:
+            st.metric("CPU Cores", stats['cpu']['count'])
+        else:
+            st.metric("CPU Cores", "N/A")
+    with col2:
+        if "cpu" in stats and "frequency" in stats["cpu"] and "current" in stats["cpu"]["frequency"]:
+            st.metric("Current Frequency", f"{stats['cpu']['frequency']['current']:.2f} MHz")
+        else:
+            st.metric("Current Frequency", "N/A")
+    with col3:
+        if "cpu" in stats and "frequency" in stats["cpu"] and "max" in stats["cpu"]["frequency"]:
+            st.metric("Max Frequency", f"{stats['cpu']['frequency']['max']:.2f} MHz")
+        else:
+            st.metric("Max Frequency", "N/A")
+
+    # Memory Details
+    st.markdown("#### Memory")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        if "memory" in stats and "total" in stats["memory"]:
+            st.metric("Total Memory", format_bytes(stats['memory']['total']))
+        else:
+            st.metric("Total Memory", "N/A")
+    with col2:
+        if "memory" in stats and "available" in stats["memory"]:
+            st.metric("Available Memory", format_bytes(stats['memory']['available']))
+        else:
+            st.metric("Available Memory", "N/A")
+    with col3:
+        if "memory" in stats and "used" in stats["memory"]:
+            st.metric("Used Memory", format_bytes(stats['memory']['used']))
+        else:
+            st.metric("Used Memory", "N/A")
+
+    # Disk Details
+    st.markdown("#### Disk")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        if "disk" in stats and "total" in stats["disk"]:
+            st.metric("Total Space", format_bytes(stats['disk']['total']))
+        else:
+            st.metric("Total Space", "N/A")
+    with col2:
+        if "disk" in stats and "free" in stats["disk"]:
+            st.metric("Free Space", format_bytes(stats['disk']['free']))
+        else:
+            st.metric("Free Space", "N/A")
+    with col3:
+        if "disk" in stats and "used" in stats["disk"]:
+            st.metric("Used Space", format_bytes(stats['disk']['used']))
+        else:
+            st.metric("Used Space", "N/A")
+
+    # Network Details
+    st.markdown("#### Network")
+    col1, col2 = st.columns(2)
+    with col1:
+        if "network" in stats and "bytes_sent" in stats["network"]:
+            st.metric("Bytes Sent", format_bytes(stats['network']['bytes_sent']))
+        else:
+            st.metric("Bytes Sent", "N/A")
+    with col2:
+        if "network" in stats and "bytes_recv" in stats["network"]:
+            st.metric("Bytes Received", format_bytes(stats['network']['bytes_recv']))
+        else:
+            st.metric("Bytes Received", "N/A")
+
+@st.fragment(run_every=30)
+def resource_history_panel():
+    check_session_timeout(activity=False)
+
+    st.markdown("### 📈 Resource History")
+    history_windows = {
+        "Last 15 minutes": 900,
+        "Last hour": 3600,
+        "Last 6 hours": 6 * 3600,
+        "Last 24 hours": 86400,
+        "Last 7 days": 7 * 86400,
+        "Last 30 days": 30 * 86400,
+        "Last year": 365 * 86400
+    }
+    window_label = st.selectbox("Time window", list(history_windows), index=1, key="history_window")
+    history = get_stats_history(history_windows[window_label])
+    if history and any(history["series"].values()):
+        charts = [
+            ("CPU Usage (%)", [("cpu", "CPU")], False),
+            ("Memory Usage (%)", [("memory", "Memory")], False),
+            ("Disk I/O", [("disk_read", "Read"), ("disk_write", "Write")], True),
+            ("Network", [("net_sent", "Sent"), ("net_recv", "Received")], True)
+        ]
+        col1, col2 = st.columns(2)
+        for index, (title, lines, is_rate) in enumerate(charts):
+            fig = go.Figure()
+            for metric, label in lines:
+                points = history["series"].get(metric, [])
+                fig.add_trace(go.Scatter(
+                    x=[point[0] for point in points],
+                    y=[point[1] for point in points],
+                    mode="lines",
+                    name=label
+                ))
+            fig.update_layout(title=title, height=300, margin=dict(l=10, r=10, t=40, b=10),
+                              yaxis=dict(title="bytes/s") if is_rate else dict(range=[0, 100]))
+            with (col1 if index % 2 == 0 else col2):
+                st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.info("No history recorded yet for this window")
+
+@st.fragment(run_every=10)
+def top_processes_panel():
+    check_session_timeout(activity=False)
+
+    st.markdown("### ⚙️ Top Processes")
+    col1, col2 = st.columns(2)
+    with col1:
+        sort_by = st.selectbox("Sort by", ["cpu", "memory", "io"],
+                               key="top_processes_by",
+                               format_func=lambda x: {"cpu": "CPU", "memory": "Memory", "io": "Disk I/O"}[x])
+    with col2:
+        top_n = st.number_input("Number of processes", min_value=5, max_value=100,
+                                value=15, key="top_processes_n")
+
+    result = get_top_processes(sort_by, top_n)
+    if result and result.get("processes"):
+        df = pd.DataFrame(result["processes"])
+        df["memory"] = df["memory_rss"].apply(format_bytes)
+        df["io"] = df["io_rate"].apply(lambda rate: f"{format_bytes(rate)}/s")
+
+        # Sortable table; click a column header to re-sort
+        st.dataframe(
+            df[["pid", "name", "username", "cpu_percent", "memory", "io"]],
+            use_container_width=True,
+            height=PAGINATION_CONFIG["height"],
+            hide_index=True
+        )
+
+        # Per-user totals over all processes, to spot accounts that are still doing work
+        st.markdown("#### Usage by User")
+        by_user = pd.DataFrame(result["by_user"])
+        by_user["memory"] = by_user["memory_rss"].apply(format_bytes)
+        by_user["io"] = by_user["io_rate"].apply(lambda rate: f"{format_bytes(rate)}/s")
+        st.dataframe(
+            by_user[["username", "processes", "cpu_percent", "memory", "io"]],
+            use_container_width=True,
+            hide_index=True
+        )
+    else:
+        st.warning("Process data not available")
+
 # Dashboard with improved UI
 def dashboard():
     if not st.session_state.authenticated:
@@ -223,291 +773,33 @@ def dashboard():
 
     st.markdown("---")
     
-    # Create tabs for better organization
-    tab1, tab2, tab3 = st.tabs(["📊 User Management", "🔍 User Details", "📈 System Monitor"])
+    # Tab switcher. Unlike st.tabs, which renders every tab, only the selected
+    # section's panels run, so the System Monitor's timed fragments stop
+    # polling the server while another section is open.
+    sections = ["📊 User Management", "🔍 User Details", "📈 System Monitor"]
+    section = st.segmented_control("Section", sections, default=sections[0], required=True,
+                                   key="dashboard_section", label_visibility="collapsed")
 
-    with tab1:
+    if section == sections[0]:
         st.subheader("User Information")
         
         # Create columns for better layout
         col1, col2 = st.columns([1, 1])
 
         with col1:
-            st.markdown("### 📋 User Data")
-            
-            # Fetch Users with loading state
-            if st.button("Fetch Users", key="fetch_users_btn"):
-                with st.spinner('Fetching users...'):
-                    df = fetch_data("users", "users")
-                    if df is not None:
-                        # Add pagination controls
-                        total_rows = len(df)
-                        if total_rows > PAGINATION_CONFIG["max_rows"]:
-                            st.warning(f"Showing first {PAGINATION_CONFIG['max_rows']} rows out of {total_rows}")
-                            df = df.head(PAGINATION_CONFIG["max_rows"])
-                        
-                        st.dataframe(
-                            df,
-                            use_container_width=True,
-                            height=PAGINATION_CONFIG["height"],
-                            hide_index=True
-                        )
-                    else:
-                        st.warning("No users found or server error.")
-
-            # Fetch Active Users with loading state
-            if st.button("Fetch Active Users", key="fetch_active_users_btn"):
-                with st.spinner('Fetching active users...'):
-                    df = fetch_data("active_users", "active_users")
-                    if df is not None:
-                        # Add pagination controls
-                        total_rows = len(df)
-                        if total_rows > PAGINATION_CONFIG["max_rows"]:
-                            st.warning(f"Showing first {PAGINATION_CONFIG['max_rows']} rows out of {total_rows}")
-                            df = df.head(PAGINATION_CONFIG["max_rows"])
-                        
-                        st.dataframe(
-                            df,
-                            use_container_width=True,
-                            height=PAGINATION_CONFIG["height"],
-                            hide_index=True
-                        )
-                    else:
-                        st.warning("No active users found or server error.")
+            user_data_panel()
 
         with col2:
-            st.markdown("### 📊 Login Logs")
-            
-            # Input fields with improved validation
-            username = st.text_input("Enter username to filter logs (leave empty for all users)", 
-                                   key="logs_username",
-                                   help="Leave empty to see all users' logs")
-            
-            days = st.number_input("Days to look back", 
-                                 min_value=1, 
-                                 max_value=365, 
-                                 value=30, 
-                                 key="logs_days",
-                                 help="Select how many days of logs to view")
-            
-            if st.button("Fetch Login Logs", key="fetch_logs_btn"):
-                with st.spinner('Fetching login logs...'):
-                    params = {}
-                    if username:
-                        params['username'] = username
-                    params['days'] = days
-                    
-                    df = fetch_data("logs", "logs", params)
-                    if df is not None:
-                        # Add pagination controls
-                        total_rows = len(df)
-                        if total_rows > PAGINATION_CONFIG["max_rows"]:
-                            st.warning(f"Showing first {PAGINATION_CONFIG['max_rows']} rows out of {total_rows}")
-                            df = df.head(PAGINATION_CONFIG["max_rows"])
-                        
-                        st.dataframe(
-                            df,
-                            use_container_width=True,
-                            height=PAGINATION_CONFIG["height"],
-                            hide_index=True
-                        )
-                    else:
-                        st.warning("No login logs found")
-
-    with tab2:
-        st.subheader("User Details")
-        
-        # User Details section with improved validation
-        username = st.text_input("Enter Username to Fetch Details", 
-                               key="user_details_username",
-                               help="Enter the username to view detailed information")
-
-        if st.button("Get User Info", key="get_user_info_btn") and username:
-            is_valid, error_msg = validate_username(username)
-            if is_valid:
-                with st.spinner('Fetching user details...'):
-                    try:
-                        response = requests.get(
-                            f"{API_CONFIG['FLASK_API_URL']}/user/{username}",
-                            timeout=API_CONFIG['TIMEOUT']
-                        )
-                        if response.status_code == 200:
-                            data = response.json()
-                            if data and "error" not in data:
-                                st.json(data)
-                            else:
-                                st.warning(data.get("error", "User not found!"))
-                        else:
-                            st.error("Failed to fetch user details.")
-                    except Exception as e:
-                        st.error(f"Error connecting to server: {e}")
-            else:
-                st.error(error_msg)
+            login_logs_panel()
 
-        # Remove User section
-        st.markdown("### 🗑️ Remove User")
-        user_to_remove = st.text_input("Enter Username to Remove", 
-                                     key="remove_user_username")
+    elif section == sections[1]:
+        user_details_panel()
 
-        if st.button("Remove User", key="remove_user_btn") and user_to_remove:
-            is_valid, error_msg = validate_username(user_to_remove)
-            if is_valid:
-                with st.spinner('Removing user...'):
-                    try:
-                        response = requests.post(
-                            f"{API_CONFIG['FLASK_API_URL']}/remove_user",
-                            json={"username": user_to_remove},
-                            timeout=API_CONFIG['TIMEOUT']
-                        )
-                        if response.status_code == 200:
-                            result = response.json()
-                            if result.get("status") == "success":
-                                st.success(f"User '{user_to_remove}' removed successfully!")
-                            else:
-                                st.error(f"Failed to remove user: {result.get('message', 'Unknown error')}")
-                        else:
-                            st.error(f"Server error: {response.status_code}")
-                    except Exception as e:
-                        st.error(f"Error connecting to server: {e}")
-            else:
-                st.error(error_msg)
-
-    with tab3:
-        st.markdown("### 🖥️ System Statistics")
-        
-        # Auto-refresh every 5 seconds
-        if 'last_refresh' not in st.session_state:
-            st.session_state.last_refresh = time.time()
-        
-        if time.time() - st.session_state.last_refresh > 5:
-            st.session_state.last_refresh = time.time()
-            st.rerun()
-        
-        stats = get_system_stats()
-        if stats and "error" not in stats:
-            # System Overview
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                if "cpu" in stats and "percent" in stats["cpu"]:
-                    st.metric("CPU Usage", f"{stats['cpu']['percent']}%")
-                else:
-                    st.metric("CPU Usage", "N/A")
-            with col2:
-                if "memory" in stats and "percent" in stats["memory"]:
-                    st.metric("Memory Usage", f"{stats['memory']['percent']}%")
-                else:
-                    st.metric("Memory Usage", "N/A")
-            with col3:
-                if "disk" in stats and "percent" in stats["disk"]:
-                    st.metric("Disk Usage", f"{stats['disk']['percent']}%")
-                else:
-                    st.metric("Disk Usage", "N/A")
-            
-            # CPU and Memory Charts
-            col1, col2 = st.columns(2)
-            with col1:
-                # CPU Usage Gauge
-                if "cpu" in stats and "percent" in stats["cpu"]:
-                    fig_cpu = go.Figure(go.Indicator(
-                        mode="gauge+number",
-                        value=stats['cpu']['percent'],
-                        title={'text': "CPU Usage"},
-                        gauge={'axis': {'range': [0, 100]},
-                              'bar': {'color': "#4A90E2"}}
-                    ))
-                    st.plotly_chart(fig_cpu, use_container_width=True)
-                else:
-                    st.warning("CPU usage data not available")
-            
-            with col2:
-                # Memory Usage Gauge
-                if "memory" in stats and "percent" in stats["memory"]:
-                    fig_mem = go.Figure(go.Indicator(
-                        mode="gauge+number",
-                        value=stats['memory']['percent'],
-                        title={'text': "Memory Usage"},
-                        gauge={'axis': {'range': [0, 100]},
-                              'bar': {'color': "#4A90E2"}}
-                    ))
-                    st.plotly_chart(fig_mem, use_container_width=True)
-                else:
-                    st.warning("Memory usage data not available")
-            
-            # Detailed System Information
-            st.markdown("### 📊 Detailed System Information")
-            
-            # CPU Details
-            st.markdown("#### CPU")
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                if "cpu" in stats and "count" in stats["cpu"]:
-                    st.metric("CPU Cores", stats['cpu']['count'])
-                else:
-                    st.metric("CPU Cores", "N/A")
-            with col2:
-                if "cpu" in stats and "frequency" in stats["cpu"] and "current" in stats["cpu"]["frequency"]:
-                    st.metric("Current Frequency", f"{stats['cpu']['frequency']['current']:.2f} MHz")
-                else:
-                    st.metric("Current Frequency", "N/A")
-            with col3:
-                if "cpu" in stats and "frequency" in stats["cpu"] and "max" in stats["cpu"]["frequency"]:
-                    st.metric("Max Frequency", f"{stats['cpu']['frequency']['max']:.2f} MHz")
-                else:
-                    st.metric("Max Frequency", "N/A")
-            
-            # Memory Details
-            st.markdown("#### Memory")
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                if "memory" in stats and "total" in stats["memory"]:
-                    st.metric("Total Memory", format_bytes(stats['memory']['total']))
-                else:
-                    st.metric("Total Memory", "N/A")
-            with col2:
-                if "memory" in stats and "available" in stats["memory"]:
-                    st.metric("Available Memory", format_bytes(stats['memory']['available']))
-                else:
-                    st.metric("Available Memory", "N/A")
-            with col3:
-                if "memory" in stats and "used" in stats["memory"]:
-                    st.metric("Used Memory", format_bytes(stats['memory']['used']))
-                else:
-                    st.metric("Used Memory", "N/A")
-            
-            # Disk Details
-            st.markdown("#### Disk")
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                if "disk" in stats and "total" in stats["disk"]:
-                    st.metric("Total Space", format_bytes(stats['disk']['total']))
-                else:
-                    st.metric("Total Space", "N/A")
-            with col2:
-                if "disk" in stats and "free" in stats["disk"]:
-                    st.metric("Free Space", format_bytes(stats['disk']['free']))
-                else:
-                    st.metric("Free Space", "N/A")
-            with col3:
-                if "disk" in stats and "used" in stats["disk"]:
-                    st.metric("Used Space", format_bytes(stats['disk']['used']))
-                else:
-                    st.metric("Used Space", "N/A")
-            
-            # Network Details
-            st.markdown("#### Network")
-            col1, col2 = st.columns(2)
-            with col1:
-                if "network" in stats and "bytes_sent" in stats["network"]:
-                    st.metric("Bytes Sent", format_bytes(stats['network']['bytes_sent']))
-                else:
-                    st.metric("Bytes Sent", "N/A")
-            with col2:
-                if "network" in stats and "bytes_recv" in stats["network"]:
-                    st.metric("Bytes Received", format_bytes(stats['network']['bytes_recv']))
-                else:
-                    st.metric("Bytes Received", "N/A")
-        else:
-            st.error("Failed to fetch system statistics")
+    else:
+        system_overview_panel()
+        system_details_panel()
+        resource_history_panel()
+        top_processes_panel()
 
 # Conditional Rendering
 if st.session_state.authenticated:
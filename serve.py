@@ -0,0 +1,96 @@
+import os
+import sys
+import signal
+import socket
+import logging
+import argparse
+import multiprocessing
+import time
+import server
+import shared_state
+
+# Production entry point: one supervisor process owns the listening socket and
+# runs the host-wide jobs (stats sampling, event log ingestion, process and
+# session refreshes) once, while N worker processes serve requests on that
+# socket and read the jobs' results from shared_state.
+WORKER_RESTART_DELAY = 1  # seconds
+
+def start_worker(context, sock, stop_flag, index):
+    worker = context.Process(target=server.run_worker, args=(sock, stop_flag), name=f"worker-{index}")
+    worker.start()
+    logging.info(f"Started worker {index} with PID {worker.pid}")
+    return worker
+
+def serve(host, port, workers):
+    server.SHARED_STATE["role"] = "leader"
+
+    if not server.acquire_pid_file(host, port, workers):
+        print(f"Server is already running (see {server.LIFECYCLE_CONFIG['pid_file']})")
+        return
+
+    # Spawn works the same on Windows and elsewhere
+    context = multiprocessing.get_context("spawn")
+    stop_flag = context.RawValue("b", 0)
+    sock = None
+    processes = []
+
+    try:
+        shared_state.init_store()
+        sock = socket.create_server((host, port), backlog=128)
+
+        def handle_signal(signum, frame):
+            logging.info(f"Shutdown requested (signal {signum}), stopping all workers")
+            stop_flag.value = 1
+
+        for name in ("SIGINT", "SIGTERM", "SIGBREAK"):
+            if hasattr(signal, name):
+                signal.signal(getattr(signal, name), handle_signal)
+
+        jobs = [server.start_stats_sampler(), server.start_host_jobs(), server.start_logon_ingester()]
+        processes = [start_worker(context, sock, stop_flag, index) for index in range(workers)]
+        logging.info(f"Serving on {host}:{port} with {workers} workers, supervisor PID {os.getpid()}")
+
+        # Replace workers that die until a shutdown is requested
+        while not stop_flag.value:
+            time.sleep(WORKER_RESTART_DELAY)
+            for index, worker in enumerate(processes):
+                if not worker.is_alive() and not stop_flag.value:
+                    logging.error(f"Worker {index} (PID {worker.pid}) exited with code {worker.exitcode}, restarting")
+                    processes[index] = start_worker(context, sock, stop_flag, index)
+
+        # Workers drain their own in-flight requests; give them the same deadline
+        timeout = server.get_requested_shutdown_timeout()
+        if timeout is None:
+            timeout = server.LIFECYCLE_CONFIG["shutdown_timeout"]
+        deadline = time.monotonic() + timeout + WORKER_RESTART_DELAY
+        for worker in processes:
+            worker.join(max(0, deadline - time.monotonic()))
+            if worker.is_alive():
+                logging.warning(f"Worker PID {worker.pid} did not stop before the deadline, terminating it")
+                worker.terminate()
+
+        server.background_stop.set()
+        for job in jobs:
+            job.join(max(0, deadline - time.monotonic()))
+
+    finally:
+        for worker in processes:
+            if worker.is_alive():
+                worker.terminate()
+        if sock:
+            sock.close()
+        server.release_pid_file()
+        logging.info("Server stopped")
+        logging.shutdown()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the API server with multiple worker processes")
+    parser.add_argument("--host", default=server.LIFECYCLE_CONFIG["host"])
+    parser.add_argument("--port", type=int, default=server.LIFECYCLE_CONFIG["port"])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Number of worker processes (default: one per CPU core)")
+    args = parser.parse_args()
+
+    if args.workers < 1:
+        sys.exit("--workers must be at least 1")
+    serve(args.host, args.port, args.workers)
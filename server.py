@@ -1,11 +1,30 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context, g
+from werkzeug.serving import make_server
 import subprocess
 import json
+import csv
+import io
+import os
+import sys
+import signal
+import argparse
 import psutil
 import logging
+import threading
+import time
+from collections import deque, Counter, OrderedDict
 import win32evtlog
 from datetime import datetime, timedelta
 import bcrypt
+import shared_state
+
+# Optional: only needed for Parquet exports
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
 
 app = Flask(__name__)
 
@@ -28,65 +47,205 @@ def load_credentials():
 
 USERNAME, HASHED_PASSWORD = load_credentials()
 
-# Get user login/logout history from Windows Event Viewer
-def get_login_history(username=None, days_back=30):
+# Serving role. "standalone" (python server.py) keeps all state in this
+# process. Under serve.py the supervisor is the "leader": it runs the
+# host-wide jobs once and publishes their results to shared_state, and the
+# "worker" processes read those instead of repeating the work.
+SHARED_STATE = {
+    "role": "standalone",
+    "versions": {},  # snapshot name -> version last loaded by this process
+    "updated": {}  # snapshot name -> wall-clock time it was published
+}
+
+def is_leader():
+    return SHARED_STATE["role"] == "leader"
+
+def is_worker():
+    return SHARED_STATE["role"] == "worker"
+
+# Read the latest published snapshot, or None if it has not changed since
+# the last one applied. Needs no lock, so callers can read before taking theirs.
+def load_shared_state(name):
+    return shared_state.load(name, SHARED_STATE["versions"].get(name, 0))
+
+# Copy a loaded snapshot into a state dict (call with its lock held), unless
+# another thread has already applied the same or a newer one. Snapshots are
+# plain JSON; `decode` rebuilds tuples, deques, etc.
+def apply_shared_state(name, target, loaded, decode=None):
+    if loaded is None or loaded[0] <= SHARED_STATE["versions"].get(name, 0):
+        return False
+    SHARED_STATE["versions"][name], SHARED_STATE["updated"][name], value = loaded
+    target.update(decode(value) if decode else value)
+    return True
+
+# Load and apply the latest snapshot (call with the state dict's lock held)
+def sync_shared_state(name, target, decode=None):
+    return apply_shared_state(name, target, load_shared_state(name), decode)
+
+# True if the supervisor has not published a snapshot recently, e.g. because
+# its host jobs have stalled; workers then collect the data themselves
+def is_stale(name):
+    updated = SHARED_STATE["updated"].get(name)
+    return updated is None or time.time() - updated > SHARED_CONFIG["stale_after"]
+
+# Event log settings
+EVENT_LOG_SERVER = 'localhost'
+EVENT_LOG_TYPE = 'Security'
+LOGON_EVENT_ID = 4624  # Successful login
+FAILED_LOGON_EVENT_ID = 4625  # Failed login
+
+LOGIN_TYPES = {
+    "2": "Local Login",
+    "3": "Network Login",
+    "4": "Batch Login",
+    "5": "Service Login",
+    "7": "Workstation Unlock",
+    "8": "Network Cleartext",
+    "9": "New Credentials",
+    "10": "Remote Desktop",
+    "11": "Cached Login"
+}
+
+# Positions of the fields we use in StringInserts, per event ID
+LOGON_EVENT_FIELDS = {
+    LOGON_EVENT_ID: {"username": 5, "logon_type": 8, "workstation": 11, "source": 18},
+    FAILED_LOGON_EVENT_ID: {"username": 5, "logon_type": 10, "workstation": 13, "source": 19}
+}
+
+# Suspicious logon detection settings
+DETECTION_CONFIG = {
+    "window": 300,  # Sliding window for failure counts, in seconds
+    "window_buckets": 10,  # Ring buckets per window
+    "user_failure_threshold": 5,  # Failed logons per user within the window
+    "source_failure_threshold": 10,  # Failed logons per source within the window
+    "business_hours": (8, 18),  # Logons outside [start, end) or on weekends are off-hours
+    "interactive_logon_types": ["2", "10", "11"],
+    "unusual_logon_types": ["8", "10"],
+    "max_tracked_keys": 10000,  # Users + sources with live counters (and recent alerts kept for deduplication)
+    "max_alerts": 1000,  # Alerts kept per severity, so low-severity noise cannot push out brute-force alerts
+    "backfill_days": 1  # Only events this recent are run through the detector on the first ingestion
+}
+
+ALERT_SEVERITIES = ["high", "medium", "low"]
+
+# Logon rollup settings
+ROLLUP_CONFIG = {
+    "retention_days": 365,  # Day buckets kept (and history ingested on the first run)
+    "inactive_days": 90  # Default threshold for accounts without a recent logon
+}
+
+# Extract the fields we use from a raw logon/failed logon event
+def parse_logon_event(event):
+    fields = LOGON_EVENT_FIELDS.get(event.EventID)
+    inserts = event.StringInserts
+    if not fields or not inserts or len(inserts) <= fields["username"]:
+        return None
+
+    def insert(name):
+        index = fields[name]
+        value = inserts[index] if len(inserts) > index else None
+        return None if value in (None, "", "-") else value
+
+    # Extract login type from StringInserts
+    logon_type = insert("logon_type")
+    if logon_type is None:
+        action = "Unknown"
+    else:
+        action = LOGIN_TYPES.get(logon_type, "Unknown Login Type")
+
+    return {
+        "record": event.RecordNumber,
+        "event_id": event.EventID,
+        "time": event.TimeGenerated,
+        "username": inserts[fields["username"]],
+        "logon_type": logon_type,
+        "action": action,
+        "source": insert("source") or insert("workstation") or "Local"
+    }
+
+# Newest record number in the log, or None if it is empty
+def get_record_range(handle):
+    oldest = win32evtlog.GetOldestEventLogRecord(handle)
+    count = win32evtlog.GetNumberOfEventLogRecords(handle)
+    return oldest, oldest + count - 1 if count else None
+
+# Read the event with the given record number
+def read_record(handle, record):
+    flags = win32evtlog.EVENTLOG_SEEK_READ | win32evtlog.EVENTLOG_FORWARDS_READ
+    events = win32evtlog.ReadEventLog(handle, flags, record)
+    return events[0] if events else None
+
+# Read events forward from a record number, stopping after `end_record`
+def read_events_forward(handle, start_record, end_record=None):
+    flags = win32evtlog.EVENTLOG_SEEK_READ | win32evtlog.EVENTLOG_FORWARDS_READ
+    events = win32evtlog.ReadEventLog(handle, flags, start_record)
+    flags = win32evtlog.EVENTLOG_SEQUENTIAL_READ | win32evtlog.EVENTLOG_FORWARDS_READ
+    while events:
+        for event in events:
+            if end_record is not None and event.RecordNumber > end_record:
+                return
+            yield event
+        events = win32evtlog.ReadEventLog(handle, flags, 0)
+
+# Find the first record written at or after start_time. Records are stored in
+# time order, so a binary search over record numbers with one seek read per
+# probe finds it in O(log n) reads instead of scanning back from the newest.
+def find_first_record_since(handle, start_time):
+    low, high = get_record_range(handle)
+    if high is None:
+        return None
+
+    first_record = None
+    while low <= high:
+        middle = (low + high) // 2
+        event = read_record(handle, middle)
+        if event is not None and event.TimeGenerated >= start_time:
+            first_record = middle
+            high = middle - 1
+        else:
+            low = middle + 1
+    return first_record
+
+# Yield successful logon events within the last `days_back` days, oldest first.
+# Only the records inside the window are read.
+def iter_logon_events(username=None, days_back=30):
+    # Calculate start time
+    start_time = datetime.now() - timedelta(days=days_back)
+
+    # Open event log
+    handle = win32evtlog.OpenEventLog(EVENT_LOG_SERVER, EVENT_LOG_TYPE)
+
     try:
-        # Parameters
-        server = 'localhost'
-        log_type = 'Security'
-        LOGON_EVENT_ID = 4624  # Successful login only
-        
-        # Calculate start time
-        start_time = datetime.now() - timedelta(days=days_back)
-        
-        # Open event log
-        handle = win32evtlog.OpenEventLog(server, log_type)
-        flags = win32evtlog.EVENTLOG_BACKWARDS_READ | win32evtlog.EVENTLOG_SEQUENTIAL_READ
-        
-        login_events = []
-        
-        # Read events in chunks
-        while True:
-            events = win32evtlog.ReadEventLog(handle, flags, 0)
-            if not events:
-                break
-                
-            for event in events:
-                if event.EventID == LOGON_EVENT_ID:
-                    # Skip events before start time
-                    if event.TimeGenerated < start_time:
-                        continue
-                    
-                    if event.StringInserts and len(event.StringInserts) > 5:
-                        current_username = event.StringInserts[5]
-                        
-                        # Check if we should include this event
-                        if not username or username.lower() in current_username.lower():
-                            # Extract login type from StringInserts
-                            login_type = "Unknown"
-                            if len(event.StringInserts) > 8:
-                                login_type_code = event.StringInserts[8]
-                                login_types = {
-                                    "2": "Local Login",
-                                    "3": "Network Login",
-                                    "4": "Batch Login",
-                                    "5": "Service Login",
-                                    "7": "Workstation Unlock",
-                                    "8": "Network Cleartext",
-                                    "9": "New Credentials",
-                                    "10": "Remote Desktop",
-                                    "11": "Cached Login"
-                                }
-                                login_type = login_types.get(login_type_code, "Unknown Login Type")
-                            
-                            login_events.append({
-                                'time': event.TimeGenerated.strftime('%Y-%m-%d %H:%M:%S'),
-                                'username': current_username,
-                                'action': login_type
-                            })
-        
+        start_record = find_first_record_since(handle, start_time)
+        if start_record is None:
+            return
+
+        # Stop at the newest record as of now rather than chasing new writes
+        end_record = get_record_range(handle)[1]
+
+        for event in read_events_forward(handle, start_record, end_record):
+            if event.EventID == LOGON_EVENT_ID:
+                # Skip events before start time
+                if event.TimeGenerated < start_time:
+                    continue
+
+                parsed = parse_logon_event(event)
+                if parsed:
+                    # Check if we should include this event
+                    if not username or username.lower() in parsed["username"].lower():
+                        yield parsed
+    finally:
         # Close the event log
         win32evtlog.CloseEventLog(handle)
+
+# Get user login/logout history from Windows Event Viewer
+def get_login_history(username=None, days_back=30):
+    try:
+        login_events = [{
+            'time': event["time"].strftime('%Y-%m-%d %H:%M:%S'),
+            'username': event["username"],
+            'action': event["action"]
+        } for event in iter_logon_events(username, days_back)]
         
         # Sort by time (most recent first)
         login_events.sort(key=lambda x: x['time'], reverse=True)
@@ -96,6 +255,440 @@ def get_login_history(username=None, days_back=30):
         logging.error(f"Error retrieving login history: {str(e)}")
         return []
 
+class SlidingWindowCounter:
+    """Count of events in the last `window` seconds, kept in a ring of time buckets.
+
+    Memory is fixed at `buckets` slots and each update touches a constant
+    number of them, independent of how many events have been counted.
+    """
+
+    __slots__ = ("bucket_size", "counts", "stamps", "latest")
+
+    def __init__(self, window, buckets):
+        self.bucket_size = window / buckets
+        self.counts = [0] * buckets
+        self.stamps = [None] * buckets
+        self.latest = None
+
+    def add(self, timestamp):
+        bucket = int(timestamp // self.bucket_size)
+        size = len(self.counts)
+
+        if self.latest is None or bucket > self.latest:
+            self.latest = bucket
+        elif bucket <= self.latest - size:
+            return self.count()  # Older than the window, ignore
+
+        slot = bucket % size
+        if self.stamps[slot] != bucket:
+            self.stamps[slot] = bucket
+            self.counts[slot] = 0
+        self.counts[slot] += 1
+        return self.count()
+
+    def count(self):
+        oldest = self.latest - len(self.counts)
+        return sum(count for count, stamp in zip(self.counts, self.stamps)
+                   if stamp is not None and stamp > oldest)
+
+# Detector state: per-user and per-source failure counters (least recently
+# used evicted first), a bounded list of raised alerts per severity and the
+# latest alert per (rule, user, source), used to fold repeats together.
+DETECTOR_STATE = {
+    "counters": OrderedDict(),
+    "alerts": {severity: deque(maxlen=DETECTION_CONFIG["max_alerts"]) for severity in ALERT_SEVERITIES},
+    "recent_alerts": OrderedDict(),  # (rule, username, source) -> (timestamp, alert)
+    "next_alert_id": 1
+}
+detector_lock = threading.Lock()
+
+# Incremental ingestion state: the newest event log record already processed,
+# and whether the first read of the retention period is still running. That
+# backfill can take minutes, so it runs on a background thread and requests
+# are served from the partial rollups meanwhile.
+INGEST_STATE = {"last_record": None, "backfilling": True}
+ingest_lock = threading.Lock()
+
+INGEST_INTERVAL = 10  # seconds between background ingestion runs
+BACKFILL_CHECK_RECORDS = 50000  # While backfilling, check for shutdown (and publish partial rollups under serve.py) this often
+
+def raise_alert(rule, severity, event, message):
+    # Repeats of a rule for the same user and source within the detection
+    # window only bump the count of the alert already raised
+    key = (rule, event["username"].lower(), event["source"])
+    timestamp = event["time"].timestamp()
+    recent_alerts = DETECTOR_STATE["recent_alerts"]
+    recent = recent_alerts.get(key)
+    if recent is not None and 0 <= timestamp - recent[0] < DETECTION_CONFIG["window"]:
+        recent[1]["count"] += 1
+        recent[1]["last_time"] = event["time"].strftime('%Y-%m-%d %H:%M:%S')
+        return
+
+    alert = {
+        "id": DETECTOR_STATE["next_alert_id"],
+        "time": event["time"].strftime('%Y-%m-%d %H:%M:%S'),
+        "last_time": event["time"].strftime('%Y-%m-%d %H:%M:%S'),
+        "count": 1,
+        "rule": rule,
+        "severity": severity,
+        "username": event["username"],
+        "source": event["source"],
+        "action": event["action"],
+        "message": message
+    }
+    DETECTOR_STATE["next_alert_id"] += 1
+    DETECTOR_STATE["alerts"][severity].append(alert)
+
+    recent_alerts[key] = (timestamp, alert)
+    recent_alerts.move_to_end(key)
+    if len(recent_alerts) > DETECTION_CONFIG["max_tracked_keys"]:
+        recent_alerts.popitem(last=False)
+    logging.warning(f"Alert [{rule}]: {message}")
+
+def count_failure(key, timestamp):
+    counters = DETECTOR_STATE["counters"]
+    counter = counters.get(key)
+    if counter is None:
+        counter = SlidingWindowCounter(DETECTION_CONFIG["window"], DETECTION_CONFIG["window_buckets"])
+        counters[key] = counter
+        if len(counters) > DETECTION_CONFIG["max_tracked_keys"]:
+            counters.popitem(last=False)
+    else:
+        counters.move_to_end(key)
+    return counter.add(timestamp)
+
+# Feed one parsed logon event through the detection rules
+def observe_logon_event(event):
+    with detector_lock:
+        if event["event_id"] == FAILED_LOGON_EVENT_ID:
+            timestamp = event["time"].timestamp()
+            window_minutes = DETECTION_CONFIG["window"] // 60
+
+            # Alert once per window when a threshold is reached, not on every failure after it
+            user_failures = count_failure(("user", event["username"].lower()), timestamp)
+            if user_failures == DETECTION_CONFIG["user_failure_threshold"]:
+                raise_alert("brute_force_user", "high", event,
+                            f"{user_failures} failed logons for '{event['username']}' within {window_minutes} minutes")
+
+            source_failures = count_failure(("source", event["source"]), timestamp)
+            if source_failures == DETECTION_CONFIG["source_failure_threshold"]:
+                raise_alert("brute_force_source", "high", event,
+                            f"{source_failures} failed logons from {event['source']} within {window_minutes} minutes")
+            return
+
+        # Machine accounts log on around the clock
+        if event["username"].endswith("$"):
+            return
+
+        if event["logon_type"] in DETECTION_CONFIG["unusual_logon_types"]:
+            raise_alert("unusual_logon_type", "medium", event,
+                        f"{event['action']} logon by '{event['username']}' from {event['source']}")
+
+        start_hour, end_hour = DETECTION_CONFIG["business_hours"]
+        off_hours = event["time"].weekday() >= 5 or not start_hour <= event["time"].hour < end_hour
+        if off_hours and event["logon_type"] in DETECTION_CONFIG["interactive_logon_types"]:
+            raise_alert("off_hours_logon", "low", event,
+                        f"Off-hours {event['action']} by '{event['username']}' at {event['time'].strftime('%a %H:%M')}")
+
+# Logon rollups, updated per ingested event. Successful logons are counted in
+# one bucket per day (by user, logon type and hour), so any window up to the
+# retention period is summarized from at most `retention_days` buckets.
+ROLLUP_STATE = {
+    "days": {},  # "YYYY-MM-DD" -> {"total", "by_user", "by_type", "by_hour"}
+    "last_logon": {},  # lowercased username -> (username, datetime)
+    "history_start": None  # Time of the oldest event ingested; the log may not reach back the full retention
+}
+rollup_lock = threading.Lock()
+
+def update_logon_rollups(event):
+    if event["event_id"] != LOGON_EVENT_ID:
+        return
+
+    day_key = event["time"].strftime('%Y-%m-%d')
+    with rollup_lock:
+        days = ROLLUP_STATE["days"]
+        day = days.get(day_key)
+        if day is None:
+            day = {"total": 0, "by_user": Counter(), "by_type": Counter(), "by_hour": [0] * 24}
+            days[day_key] = day
+
+        day["total"] += 1
+        day["by_user"][event["username"]] += 1
+        day["by_type"][event["action"]] += 1
+        day["by_hour"][event["time"].hour] += 1
+
+        user_key = event["username"].lower()
+        last = ROLLUP_STATE["last_logon"].get(user_key)
+        if last is None or event["time"] > last[1]:
+            ROLLUP_STATE["last_logon"][user_key] = (event["username"], event["time"])
+
+# Drop day buckets older than the retention period
+def prune_logon_rollups():
+    cutoff = (datetime.now() - timedelta(days=ROLLUP_CONFIG["retention_days"])).strftime('%Y-%m-%d')
+    with rollup_lock:
+        days = ROLLUP_STATE["days"]
+        for day_key in [day_key for day_key in days if day_key < cutoff]:
+            del days[day_key]
+
+# Process event log records that arrived since the previous call. Only new
+# records are read, so the cost follows the event rate, not the log size.
+# With wait=False (from a request) nothing is read until the backfill has
+# finished, and the call returns at once if another ingestion is running.
+def ingest_logon_events(wait=True):
+    if is_worker():
+        # The supervisor reads the event log; pick up its alerts and rollups
+        with detector_lock:
+            sync_shared_state("alerts", DETECTOR_STATE, decode_alerts)
+        with rollup_lock:
+            sync_shared_state("rollups", ROLLUP_STATE, decode_rollups)
+        sync_shared_state("ingest", INGEST_STATE)
+        return
+
+    if not wait and INGEST_STATE["backfilling"]:
+        return
+    if not ingest_lock.acquire(blocking=wait):
+        return
+
+    try:
+        handle = win32evtlog.OpenEventLog(EVENT_LOG_SERVER, EVENT_LOG_TYPE)
+        try:
+            oldest, newest = get_record_range(handle)
+            last_record = INGEST_STATE["last_record"]
+            backfilling = INGEST_STATE["backfilling"]
+
+            if newest is None:
+                # Empty (freshly cleared) log
+                INGEST_STATE["last_record"] = None
+                if backfilling:
+                    INGEST_STATE["backfilling"] = False
+                    if is_leader():
+                        publish_logon_state()
+                return
+
+            # First run, or the log has been cleared since
+            if last_record is None or last_record > newest:
+                start_time = datetime.now() - timedelta(days=ROLLUP_CONFIG["retention_days"])
+                start_record = find_first_record_since(handle, start_time)
+                last_record = newest
+
+                # The Security log often rolls over long before the retention period
+                with rollup_lock:
+                    if ROLLUP_STATE["history_start"] is None:
+                        first_event = read_record(handle, start_record) if start_record is not None else None
+                        ROLLUP_STATE["history_start"] = first_event.TimeGenerated if first_event else datetime.now()
+            elif last_record < newest:
+                start_record = max(last_record + 1, oldest)
+            else:
+                start_record = None
+
+            events = read_events_forward(handle, start_record, newest) if start_record is not None else []
+
+            # History older than the detection backfill only goes into the rollups
+            detect_since = datetime.now() - timedelta(days=DETECTION_CONFIG["backfill_days"])
+
+            processed = 0
+            for count, event in enumerate(events, 1):
+                if backfilling and count % BACKFILL_CHECK_RECORDS == 0:
+                    if background_stop.is_set():
+                        return  # Shutting down; the partial backfill is discarded
+                    if is_leader():
+                        publish_logon_state()
+
+                if event.EventID in LOGON_EVENT_FIELDS:
+                    parsed = parse_logon_event(event)
+                    if parsed:
+                        update_logon_rollups(parsed)
+                        if parsed["time"] >= detect_since:
+                            observe_logon_event(parsed)
+                        processed += 1
+
+                # Advance per event: if a read fails part way (e.g. the log
+                # wrapped mid-read), the next run resumes after this record
+                # instead of counting what was already ingested again
+                INGEST_STATE["last_record"] = event.RecordNumber
+
+            prune_logon_rollups()
+
+            INGEST_STATE["last_record"] = max(last_record, INGEST_STATE["last_record"] or 0)
+            INGEST_STATE["backfilling"] = False
+            if processed:
+                logging.info(f"Ingested {processed} new logon events")
+            if (processed or backfilling) and is_leader():
+                publish_logon_state()
+        finally:
+            win32evtlog.CloseEventLog(handle)
+    except Exception:
+        # A failed backfill starts over from nothing on the next run
+        if INGEST_STATE["backfilling"]:
+            reset_logon_state()
+        raise
+    finally:
+        ingest_lock.release()
+
+# Forget everything ingested so far. Alert ids keep increasing, so clients
+# polling with ?since= are not confused.
+def reset_logon_state():
+    with detector_lock:
+        DETECTOR_STATE["counters"].clear()
+        DETECTOR_STATE["recent_alerts"].clear()
+        for alerts in DETECTOR_STATE["alerts"].values():
+            alerts.clear()
+    with rollup_lock:
+        ROLLUP_STATE["days"].clear()
+        ROLLUP_STATE["last_logon"].clear()
+        ROLLUP_STATE["history_start"] = None
+    INGEST_STATE["last_record"] = None
+
+# JSON forms of the alert and rollup state published under serve.py
+def decode_alerts(value):
+    return {
+        "alerts": {severity: deque(alerts, maxlen=DETECTION_CONFIG["max_alerts"])
+                   for severity, alerts in value["alerts"].items()},
+        "next_alert_id": value["next_alert_id"]
+    }
+
+def encode_rollups():
+    history_start = ROLLUP_STATE["history_start"]
+    return {
+        "days": ROLLUP_STATE["days"],  # Counters encode as plain objects
+        "last_logon": {key: [username, logon.isoformat()]
+                       for key, (username, logon) in ROLLUP_STATE["last_logon"].items()},
+        "history_start": history_start.isoformat() if history_start else None
+    }
+
+def decode_rollups(value):
+    return {
+        "days": {day_key: {"total": day["total"], "by_user": Counter(day["by_user"]),
+                           "by_type": Counter(day["by_type"]), "by_hour": day["by_hour"]}
+                 for day_key, day in value["days"].items()},
+        "last_logon": {key: (username, datetime.fromisoformat(logon))
+                       for key, (username, logon) in value["last_logon"].items()},
+        "history_start": datetime.fromisoformat(value["history_start"]) if value["history_start"] else None
+    }
+
+def publish_logon_state():
+    with detector_lock:
+        shared_state.publish("alerts", {
+            "alerts": {severity: list(alerts) for severity, alerts in DETECTOR_STATE["alerts"].items()},
+            "next_alert_id": DETECTOR_STATE["next_alert_id"]
+        })
+    with rollup_lock:
+        shared_state.publish("rollups", encode_rollups())
+    shared_state.publish("ingest", {"backfilling": INGEST_STATE["backfilling"]})
+
+def run_logon_ingester():
+    logging.info("Logon event ingester started")
+    while not background_stop.is_set():
+        try:
+            ingest_logon_events()
+        except Exception as e:
+            logging.error(f"Error ingesting logon events: {str(e)}")
+        background_stop.wait(INGEST_INTERVAL)
+    logging.info("Logon event ingester stopped")
+
+def start_logon_ingester():
+    ingester = threading.Thread(target=run_logon_ingester, name="logon-ingester", daemon=True)
+    ingester.start()
+    return ingester
+
+# Summarize logons over the last `days` days from the day buckets, plus the
+# last logon of every local account
+def get_logon_summary(days=30, username=None, inactive_days=None):
+    try:
+        ingest_logon_events(wait=False)
+        inactive_days = inactive_days or ROLLUP_CONFIG["inactive_days"]
+        now = datetime.now()
+        start_key = (now - timedelta(days=days - 1)).strftime('%Y-%m-%d')
+
+        by_user = Counter()
+        by_type = Counter()
+        by_hour = [0] * 24
+        by_day = {}
+
+        with rollup_lock:
+            for day_key, day in sorted(ROLLUP_STATE["days"].items()):
+                if day_key < start_key:
+                    continue
+                if username:
+                    # Per-user daily counts for a single account
+                    count = sum(n for user, n in day["by_user"].items() if user.lower() == username.lower())
+                    if count:
+                        by_day[day_key] = count
+                    continue
+                by_day[day_key] = day["total"]
+                by_user.update(day["by_user"])
+                by_type.update(day["by_type"])
+                for hour, count in enumerate(day["by_hour"]):
+                    by_hour[hour] += count
+
+            last_logon = dict(ROLLUP_STATE["last_logon"])
+            history_start = ROLLUP_STATE["history_start"]
+
+        # How far back the ingested history actually reaches
+        if history_start is not None:
+            history_start = max(history_start, now - timedelta(days=ROLLUP_CONFIG["retention_days"]))
+            history_days = (now - history_start).days
+        else:
+            history_days = 0
+
+        # Join with the local account list. An account with no logon in the
+        # history is only inactive if the history covers the whole threshold;
+        # otherwise it is unknown (None), not a candidate for removal.
+        accounts = []
+        for account in get_users().get("users", []):
+            last = last_logon.get(account.lower())
+            days_since = (now - last[1]).days if last else None
+            if days_since is not None:
+                inactive = days_since >= inactive_days
+            else:
+                inactive = True if history_days >= inactive_days else None
+            accounts.append({
+                "username": account,
+                "last_logon": last[1].strftime('%Y-%m-%d %H:%M:%S') if last else None,
+                "days_since_logon": days_since,
+                "inactive": inactive
+            })
+
+        summary = {
+            "days": days,
+            "total": sum(by_day.values()),
+            "by_day": by_day,
+            "accounts": accounts,
+            "inactive_accounts": [account["username"] for account in accounts if account["inactive"]],
+            "unknown_accounts": [account["username"] for account in accounts if account["inactive"] is None],
+            "inactive_days": inactive_days,
+            "history_days": history_days,
+            "history_start": history_start.strftime('%Y-%m-%d %H:%M:%S') if history_start else None,
+            "backfilling": INGEST_STATE["backfilling"]
+        }
+        if username:
+            summary["username"] = username
+        else:
+            summary["by_user"] = dict(by_user.most_common())
+            summary["by_type"] = dict(by_type.most_common())
+            summary["by_hour"] = by_hour
+        return summary
+    except Exception as e:
+        logging.error(f"Error building logon summary: {str(e)}")
+        return {"error": f"Failed to build logon summary: {str(e)}"}
+
+# Get alerts raised after the given alert id
+def get_alerts(since=0):
+    try:
+        ingest_logon_events(wait=False)
+        with detector_lock:
+            alerts = [dict(alert) for severity in ALERT_SEVERITIES
+                      for alert in DETECTOR_STATE["alerts"][severity] if alert["id"] > since]
+            alerts.sort(key=lambda x: x["id"])
+            return {
+                "alerts": alerts,
+                "last_id": DETECTOR_STATE["next_alert_id"] - 1,
+                "backfilling": INGEST_STATE["backfilling"]
+            }
+    except Exception as e:
+        logging.error(f"Error retrieving alerts: {str(e)}")
+        return {"error": f"Failed to fetch alerts: {str(e)}"}
+
 # Get all Windows user accounts
 def get_users():
     try:
@@ -143,23 +736,161 @@ def get_user_info(username):
         logging.error(f"Error retrieving details for {username}: {str(e)}")
         return {"error": f"Failed to fetch details for {username}"}
 
+# Versioned set of active sessions. Each refresh diffs psutil.users() against
+# the known set and records added/removed sessions in a bounded change log, so
+# clients can fetch only what changed since the version they last saw. The
+# epoch names the numbering: versions from another epoch (a restarted server,
+# or a serve.py worker tracking sessions itself) mean nothing here.
+LOCAL_SESSION_EPOCH = f"{os.getpid()}-{int(time.time() * 1000)}"
+
+SESSION_STATE = {
+    "epoch": LOCAL_SESSION_EPOCH,
+    "version": 0,
+    "sessions": {},  # session key -> formatted session
+    "changes": deque(maxlen=1000)  # (version, "added"|"removed", key, session)
+}
+session_condition = threading.Condition()
+
+SESSION_POLL_INTERVAL = 1  # seconds between psutil.users() checks while long-polling
+SESSION_MAX_WAIT = 30  # seconds
+
+def session_key(session):
+    return (session.name, session.terminal, session.host, session.started)
+
+def format_session(session):
+    # Convert Unix timestamp to datetime
+    started_time = datetime.fromtimestamp(session.started).strftime('%Y-%m-%d %H:%M:%S')
+    return {
+        "user": session.name,
+        "host": session.host if session.host else "Local",
+        "started": started_time
+    }
+
+# JSON form of SESSION_STATE published under serve.py; session keys become lists
+def encode_sessions():
+    return {
+        "epoch": SESSION_STATE["epoch"],
+        "version": SESSION_STATE["version"],
+        "sessions": [[list(key), session] for key, session in SESSION_STATE["sessions"].items()],
+        "changes": [[version, change, list(key), session]
+                    for version, change, key, session in SESSION_STATE["changes"]]
+    }
+
+def decode_sessions(value):
+    return {
+        "epoch": value["epoch"],
+        "version": value["version"],
+        "sessions": {tuple(key): session for key, session in value["sessions"]},
+        "changes": deque(((version, change, tuple(key), session)
+                          for version, change, key, session in value["changes"]),
+                         maxlen=SESSION_STATE["changes"].maxlen)
+    }
+
+# Diff the live sessions against the known set and bump the version per change
+def refresh_sessions():
+    if is_worker():
+        with session_condition:
+            if sync_shared_state("sessions", SESSION_STATE, decode_sessions):
+                session_condition.notify_all()
+            if not is_stale("sessions"):
+                return
+            # The supervisor has stopped publishing; track sessions here until
+            # it resumes, under this process's own epoch
+            if SESSION_STATE["epoch"] != LOCAL_SESSION_EPOCH:
+                SESSION_STATE["epoch"] = LOCAL_SESSION_EPOCH
+                session_condition.notify_all()
+
+    current = {session_key(session): session for session in psutil.users()}
+
+    with session_condition:
+        known = SESSION_STATE["sessions"]
+        added = [key for key in current if key not in known]
+        removed = [key for key in known if key not in current]
+
+        for key in added:
+            known[key] = format_session(current[key])
+            SESSION_STATE["version"] += 1
+            SESSION_STATE["changes"].append((SESSION_STATE["version"], "added", key, known[key]))
+
+        for key in removed:
+            session = known.pop(key)
+            SESSION_STATE["version"] += 1
+            SESSION_STATE["changes"].append((SESSION_STATE["version"], "removed", key, session))
+
+        if added or removed:
+            session_condition.notify_all()
+
 # Get active user sessions
 def get_active_users():
     try:
-        users = []
-        for session in psutil.users():
-            # Convert Unix timestamp to datetime
-            started_time = datetime.fromtimestamp(session.started).strftime('%Y-%m-%d %H:%M:%S')
-            users.append({
-                "user": session.name,
-                "host": session.host if session.host else "Local",
-                "started": started_time
-            })
-        return {"active_users": users}
+        refresh_sessions()
+        with session_condition:
+            return {
+                "active_users": list(SESSION_STATE["sessions"].values()),
+                "version": SESSION_STATE["version"],
+                "epoch": SESSION_STATE["epoch"]
+            }
     except Exception as e:
         logging.error(f"Error retrieving active users: {str(e)}")
         return {"error": "Failed to fetch active users"}
 
+# Get sessions added or removed since a version of the given epoch,
+# optionally waiting for changes
+def get_session_changes(since, wait=0, epoch=None):
+    try:
+        deadline = time.monotonic() + wait
+
+        while True:
+            refresh_sessions()
+
+            with session_condition:
+                version = SESSION_STATE["version"]
+                current_epoch = SESSION_STATE["epoch"]
+                changes = SESSION_STATE["changes"]
+                oldest = changes[0][0] if changes else version + 1
+
+                # The client's version is from another epoch, or too far behind
+                # (or ahead) to diff against: resync
+                other_epoch = epoch != current_epoch if epoch else since > 0
+                if other_epoch or since > version or since < oldest - 1:
+                    return {
+                        "epoch": current_epoch,
+                        "version": version,
+                        "reset": True,
+                        "active_users": list(SESSION_STATE["sessions"].values())
+                    }
+
+                if version > since:
+                    added = {}
+                    removed = {}
+                    for change_version, change, key, session in changes:
+                        if change_version <= since:
+                            continue
+                        if change == "added":
+                            added[key] = session
+                        elif key in added:
+                            # Logged on and off again within the range
+                            del added[key]
+                        else:
+                            removed[key] = session
+
+                    return {
+                        "epoch": current_epoch,
+                        "version": version,
+                        "added": list(added.values()),
+                        "removed": list(removed.values())
+                    }
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or shutdown_event.is_set():
+                    return {"epoch": current_epoch, "version": version, "added": [], "removed": []}
+
+                session_condition.wait(min(remaining, SESSION_POLL_INTERVAL))
+
+    except Exception as e:
+        logging.error(f"Error retrieving session changes: {str(e)}")
+        return {"error": "Failed to fetch session changes"}
+
 # Remove a user account
 def remove_user(username):
     try:
@@ -192,99 +923,821 @@ def remove_user(username):
         logging.error(f"Error removing user {username}: {str(e)}")
         return {"status": "error", "message": str(e)}
 
-# Get system statistics
-def get_system_stats():
+# Stats collectors. Each collector fills part of one section of the
+# /system_stats response and is cached for its own TTL (seconds), so values
+# that barely change (core count, boot time, disk size) are not re-read on
+# every call and only the requested sections are collected at all.
+def collect_cpu_usage():
+    # Non-blocking: the percentage covers the time since the previous call
+    return {"percent": psutil.cpu_percent(interval=None)}
+
+def collect_cpu_info():
+    cpu_freq = psutil.cpu_freq()
+    return {
+        "count": psutil.cpu_count(),
+        "frequency": {
+            "current": cpu_freq.current if cpu_freq else 0,
+            "min": cpu_freq.min if cpu_freq else 0,
+            "max": cpu_freq.max if cpu_freq else 0
+        }
+    }
+
+def collect_memory():
+    memory = psutil.virtual_memory()
+    return {
+        "total": memory.total,
+        "available": memory.available,
+        "used": memory.used,
+        "percent": memory.percent
+    }
+
+def collect_swap():
+    swap = psutil.swap_memory()
+    return {
+        "swap_total": swap.total,
+        "swap_used": swap.used,
+        "swap_percent": swap.percent
+    }
+
+def collect_disk_usage():
+    disk = psutil.disk_usage('/')
+    return {
+        "total": disk.total,
+        "used": disk.used,
+        "free": disk.free,
+        "percent": disk.percent
+    }
+
+def collect_disk_io():
+    disk_io = psutil.disk_io_counters()
+    return {
+        "read_bytes": disk_io.read_bytes if disk_io else 0,
+        "write_bytes": disk_io.write_bytes if disk_io else 0
+    }
+
+def collect_network():
+    net_io = psutil.net_io_counters()
+    return {
+        "bytes_sent": net_io.bytes_sent if net_io else 0,
+        "bytes_recv": net_io.bytes_recv if net_io else 0,
+        "packets_sent": net_io.packets_sent if net_io else 0,
+        "packets_recv": net_io.packets_recv if net_io else 0
+    }
+
+def collect_boot_time():
+    boot_time = datetime.fromtimestamp(psutil.boot_time())
+    return {"boot_time": boot_time.strftime('%Y-%m-%d %H:%M:%S')}
+
+def collect_uptime():
+    uptime = datetime.now() - datetime.fromtimestamp(psutil.boot_time())
+    return {"uptime": str(uptime)}
+
+def collect_process_count():
+    return {"process_count": len(psutil.pids())}
+
+STATS_COLLECTORS = {
+    "cpu_usage": {"section": "cpu", "ttl": 1, "collect": collect_cpu_usage},
+    "cpu_info": {"section": "cpu", "ttl": 60, "collect": collect_cpu_info},
+    "memory": {"section": "memory", "ttl": 1, "collect": collect_memory},
+    "swap": {"section": "memory", "ttl": 5, "collect": collect_swap},
+    "disk_usage": {"section": "disk", "ttl": 30, "collect": collect_disk_usage},
+    "disk_io": {"section": "disk", "ttl": 1, "collect": collect_disk_io},
+    "network": {"section": "network", "ttl": 1, "collect": collect_network},
+    "boot_time": {"section": "system", "ttl": 3600, "collect": collect_boot_time},
+    "uptime": {"section": "system", "ttl": 1, "collect": collect_uptime},
+    "process_count": {"section": "system", "ttl": 5, "collect": collect_process_count}
+}
+
+STATS_SECTIONS = ["cpu", "memory", "disk", "network", "system"]
+CRITICAL_STATS_SECTIONS = ["cpu", "memory", "disk"]
+
+# name -> (expires_at, value)
+STATS_CACHE = {}
+# serve.py workers: name -> {"expires_at" (wall clock), "value"}, as published by the supervisor
+SHARED_STATS = {}
+stats_cache_lock = threading.Lock()
+
+# Prime psutil's CPU counters so the first non-blocking read is meaningful
+psutil.cpu_percent(interval=None)
+
+# Run a collector, or return its cached value if it has not expired yet
+def run_collector(name):
+    collector = STATS_COLLECTORS[name]
+    now = time.monotonic()
+
+    with stats_cache_lock:
+        if is_worker():
+            # The supervisor keeps these fresh (see sync_shared_stats); collect
+            # here only if its value has expired
+            shared = SHARED_STATS.get(name)
+            if shared and time.time() < shared["expires_at"] + SHARED_CONFIG["publish_grace"]:
+                return shared["value"]
+
+        cached = STATS_CACHE.get(name)
+        if cached and cached[0] > now:
+            return cached[1]
+
+        value = collector["collect"]()
+        STATS_CACHE[name] = (now + collector["ttl"], value)
+        return value
+
+# serve.py workers: pick up the supervisor's latest stats, once per request
+# rather than per collector. The database read is done before taking
+# stats_cache_lock so other requests do not wait on it.
+def sync_shared_stats():
+    if is_worker():
+        loaded = load_shared_state("stats_cache")
+        with stats_cache_lock:
+            apply_shared_state("stats_cache", SHARED_STATS, loaded)
+
+# Get system statistics, running only the collectors for the requested sections
+def get_system_stats(fields=None):
     try:
+        sync_shared_stats()
+        sections = fields or STATS_SECTIONS
         stats = {}
-        
-        # CPU Information
+
+        for section in sections:
+            stats[section] = {}
+            for name, collector in STATS_COLLECTORS.items():
+                if collector["section"] != section:
+                    continue
+                try:
+                    stats[section].update(run_collector(name))
+                except Exception as e:
+                    logging.error(f"Error getting {section} stats ({name}): {str(e)}")
+                    stats[section] = {"error": str(e)}
+                    break
+
+        # Check if any critical component failed
+        if any("error" in stats[section] for section in sections if section in CRITICAL_STATS_SECTIONS):
+            logging.error("Critical system stats collection failed")
+            return {"error": "Failed to collect critical system statistics"}
+
+        logging.info(f"Successfully retrieved system statistics: {', '.join(sections)}")
+        return stats
+
+    except Exception as e:
+        logging.error(f"Critical error in get_system_stats: {str(e)}")
+        return {"error": f"Failed to fetch system statistics: {str(e)}"}
+
+# Stats history. A background sampler records a raw sample every few seconds
+# and rolls samples up into per-minute and per-hour averages. Each tier is a
+# bounded ring, so memory and query cost are fixed whatever the time window.
+HISTORY_CONFIG = {
+    "sample_interval": 5,  # seconds
+    "tiers": [
+        {"name": "raw", "resolution": 5, "retention": 6 * 3600},
+        {"name": "minute", "resolution": 60, "retention": 7 * 86400},
+        {"name": "hour", "resolution": 3600, "retention": 365 * 86400}
+    ],
+    "default_points": 300,
+    "max_points": 2000
+}
+
+HISTORY_METRICS = ["cpu", "memory", "disk_read", "disk_write", "net_sent", "net_recv"]
+
+HISTORY_STATE = {
+    # tier name -> deque of (timestamp, {metric: value})
+    "tiers": {tier["name"]: deque(maxlen=tier["retention"] // tier["resolution"])
+              for tier in HISTORY_CONFIG["tiers"]},
+    # tier name -> bucket being averaged: {"start", "count", "sums"}
+    "pending": {},
+    "previous_counters": None
+}
+history_lock = threading.Lock()
+background_stop = threading.Event()
+
+# Take one sample; disk and network counters become per-second rates
+def take_stats_sample():
+    now = time.time()
+    cpu = run_collector("cpu_usage")
+    memory = run_collector("memory")
+    disk_io = run_collector("disk_io")
+    network = run_collector("network")
+
+    counters = (now, disk_io["read_bytes"], disk_io["write_bytes"],
+                network["bytes_sent"], network["bytes_recv"])
+    previous = HISTORY_STATE["previous_counters"]
+    HISTORY_STATE["previous_counters"] = counters
+    if previous is None:
+        return None
+
+    elapsed = max(now - previous[0], 1e-6)
+    rates = [max(current - last, 0) / elapsed for current, last in zip(counters[1:], previous[1:])]
+    return now, {
+        "cpu": cpu["percent"],
+        "memory": memory["percent"],
+        "disk_read": rates[0],
+        "disk_write": rates[1],
+        "net_sent": rates[2],
+        "net_recv": rates[3]
+    }
+
+def record_stats_sample(timestamp, sample):
+    with history_lock:
+        for index, tier in enumerate(HISTORY_CONFIG["tiers"]):
+            name = tier["name"]
+            if index == 0:
+                # The finest tier keeps samples as taken
+                HISTORY_STATE["tiers"][name].append((timestamp, sample))
+                if is_leader():
+                    shared_state.append_sample(name, timestamp, sample, tier["retention"])
+                continue
+
+            # Average samples into the tier's current bucket; flush when it rolls over
+            bucket_start = timestamp - timestamp % tier["resolution"]
+            pending = HISTORY_STATE["pending"].get(name)
+            if pending and pending["start"] != bucket_start:
+                averages = {metric: total / pending["count"] for metric, total in pending["sums"].items()}
+                HISTORY_STATE["tiers"][name].append((pending["start"], averages))
+                if is_leader():
+                    shared_state.append_sample(name, pending["start"], averages, tier["retention"])
+                pending = None
+            if pending is None:
+                pending = {"start": bucket_start, "count": 0, "sums": dict.fromkeys(sample, 0.0)}
+                HISTORY_STATE["pending"][name] = pending
+            pending["count"] += 1
+            for metric, value in sample.items():
+                pending["sums"][metric] += value
+
+def run_stats_sampler():
+    logging.info("Stats history sampler started")
+    while not background_stop.is_set():
         try:
-            cpu_percent = psutil.cpu_percent(interval=1)
-            cpu_count = psutil.cpu_count()
-            cpu_freq = psutil.cpu_freq()
-            stats["cpu"] = {
-                "percent": cpu_percent,
-                "count": cpu_count,
-                "frequency": {
-                    "current": cpu_freq.current if cpu_freq else 0,
-                    "min": cpu_freq.min if cpu_freq else 0,
-                    "max": cpu_freq.max if cpu_freq else 0
-                }
-            }
+            result = take_stats_sample()
+            if result:
+                record_stats_sample(*result)
         except Exception as e:
-            logging.error(f"Error getting CPU stats: {str(e)}")
-            stats["cpu"] = {"error": str(e)}
-        
-        # Memory Information
+            logging.error(f"Error sampling system stats: {str(e)}")
+        background_stop.wait(HISTORY_CONFIG["sample_interval"])
+    logging.info("Stats history sampler stopped")
+
+def start_stats_sampler():
+    sampler = threading.Thread(target=run_stats_sampler, name="stats-sampler", daemon=True)
+    sampler.start()
+    return sampler
+
+# Largest-Triangle-Three-Buckets downsampling of (x, y) points: keeps the
+# first and last points and, per bucket, the point that best preserves the
+# visual shape of the line.
+def downsample_lttb(points, threshold):
+    if threshold >= len(points) or threshold < 3:
+        return list(points)
+
+    sampled = [points[0]]
+    bucket_size = (len(points) - 2) / (threshold - 2)
+    previous = 0
+
+    for i in range(threshold - 2):
+        # Average of the next bucket, used as the third triangle vertex
+        next_start = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, len(points))
+        next_bucket = points[next_start:next_end]
+        avg_x = sum(point[0] for point in next_bucket) / len(next_bucket)
+        avg_y = sum(point[1] for point in next_bucket) / len(next_bucket)
+
+        prev_x, prev_y = points[previous]
+        max_area = -1
+        selected = next_start - 1
+        for j in range(int(i * bucket_size) + 1, next_start):
+            x, y = points[j]
+            area = abs((prev_x - avg_x) * (y - prev_y) - (prev_x - x) * (avg_y - prev_y))
+            if area > max_area:
+                max_area = area
+                selected = j
+
+        sampled.append(points[selected])
+        previous = selected
+
+    sampled.append(points[-1])
+    return sampled
+
+# Get downsampled history for the last `window` seconds from the finest tier covering it
+def get_stats_history(window=3600, points=300, metrics=None):
+    try:
+        metrics = metrics or HISTORY_METRICS
+        tiers = HISTORY_CONFIG["tiers"]
+        tier = next((tier for tier in tiers if tier["retention"] >= window), tiers[-1])
+        start = time.time() - window
+
+        if is_worker():
+            samples = shared_state.read_samples(tier["name"], start)
+        else:
+            with history_lock:
+                samples = [(timestamp, sample) for timestamp, sample in HISTORY_STATE["tiers"][tier["name"]]
+                           if timestamp >= start]
+
+        series = {}
+        for metric in metrics:
+            line = downsample_lttb([(timestamp, sample[metric]) for timestamp, sample in samples], points)
+            series[metric] = [[datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S'), round(value, 2)]
+                              for timestamp, value in line]
+
+        return {
+            "window": window,
+            "tier": tier["name"],
+            "resolution": tier["resolution"],
+            "series": series
+        }
+    except Exception as e:
+        logging.error(f"Error retrieving stats history: {str(e)}")
+        return {"error": f"Failed to fetch stats history: {str(e)}"}
+
+# Long-lived psutil.Process objects keyed by pid. Keeping the same objects
+# between calls lets cpu_percent() and the I/O rate report the delta since the
+# previous call instead of blocking for a sampling interval.
+PROCESS_CACHE = {}  # pid -> {"process", "io": (timestamp, bytes) or None}
+process_cache_lock = threading.Lock()
+
+TOP_PROCESS_SORT_KEYS = {
+    "cpu": "cpu_percent",
+    "memory": "memory_rss",
+    "io": "io_rate"
+}
+
+# Cumulative bytes read and written by a process, or None if not available
+def read_process_io(proc):
+    try:
+        io = proc.io_counters()
+        return time.monotonic(), io.read_bytes + io.write_bytes
+    except (psutil.AccessDenied, AttributeError):
+        return None
+
+# Add new pids and drop exited ones without rebuilding the whole map. A pid
+# reused by a new process is dropped and picked up again as new.
+def refresh_process_cache():
+    current_pids = set(psutil.pids())
+
+    # is_running() compares create times, so it also catches a reused pid
+    for pid, entry in list(PROCESS_CACHE.items()):
+        if pid not in current_pids or not entry["process"].is_running():
+            del PROCESS_CACHE[pid]
+
+    for pid in current_pids - PROCESS_CACHE.keys():
         try:
-            memory = psutil.virtual_memory()
-            swap = psutil.swap_memory()
-            stats["memory"] = {
-                "total": memory.total,
-                "available": memory.available,
-                "used": memory.used,
-                "percent": memory.percent,
-                "swap_total": swap.total,
-                "swap_used": swap.used,
-                "swap_percent": swap.percent
-            }
-        except Exception as e:
-            logging.error(f"Error getting memory stats: {str(e)}")
-            stats["memory"] = {"error": str(e)}
-        
-        # Disk Information
+            proc = psutil.Process(pid)
+            proc.cpu_percent(interval=None)  # Prime the CPU delta
+            PROCESS_CACHE[pid] = {"process": proc, "io": read_process_io(proc)}
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            pass
+
+# Snapshot of every process with its usage figures
+def collect_processes():
+    processes = []
+    with process_cache_lock:
+        refresh_process_cache()
+
+        for pid, entry in list(PROCESS_CACHE.items()):
+            proc = entry["process"]
+            try:
+                with proc.oneshot():
+                    memory_info = proc.memory_info()
+                    try:
+                        username = proc.username()
+                    except psutil.AccessDenied:
+                        username = "N/A"
+
+                    # Bytes per second since the previous call, like cpu_percent()
+                    io = read_process_io(proc)
+                    previous = entry["io"]
+                    entry["io"] = io
+                    if io and previous:
+                        io_rate = max(io[1] - previous[1], 0) / max(io[0] - previous[0], 1e-6)
+                    else:
+                        io_rate = 0.0
+
+                    processes.append({
+                        "pid": pid,
+                        "name": proc.name(),
+                        "username": username,
+                        "cpu_percent": proc.cpu_percent(interval=None),
+                        "memory_rss": memory_info.rss,
+                        "io_rate": io_rate,
+                        "io_bytes": io[1] if io else 0
+                    })
+            except psutil.NoSuchProcess:
+                PROCESS_CACHE.pop(pid, None)
+            except (psutil.AccessDenied, psutil.ZombieProcess):
+                pass
+    return processes
+
+# Per-user totals over every process, not just the top N
+def summarize_process_users(processes, sort_key):
+    by_user = {}
+    for process in processes:
+        totals = by_user.get(process["username"])
+        if totals is None:
+            totals = {"username": process["username"], "processes": 0,
+                      "cpu_percent": 0.0, "memory_rss": 0, "io_rate": 0.0}
+            by_user[process["username"]] = totals
+        totals["processes"] += 1
+        totals["cpu_percent"] += process["cpu_percent"]
+        totals["memory_rss"] += process["memory_rss"]
+        totals["io_rate"] += process["io_rate"]
+    return sorted(by_user.values(), key=lambda x: x[sort_key], reverse=True)
+
+# Process list published by the supervisor, in worker processes
+PROCESS_SNAPSHOT = {"processes": None}
+
+# Get the top N processes by CPU, memory or I/O, plus per-user totals
+def get_top_processes(by="cpu", n=10):
+    try:
+        processes = None
+        if is_worker():
+            with process_cache_lock:
+                sync_shared_state("processes", PROCESS_SNAPSHOT)
+                if PROCESS_SNAPSHOT["processes"] is not None and not is_stale("processes"):
+                    processes = list(PROCESS_SNAPSHOT["processes"])
+        if processes is None:
+            processes = collect_processes()
+
+        sort_key = TOP_PROCESS_SORT_KEYS[by]
+        processes.sort(key=lambda x: x[sort_key], reverse=True)
+        return {
+            "processes": processes[:n],
+            "total": len(processes),
+            "by_user": summarize_process_users(processes, sort_key)
+        }
+    except Exception as e:
+        logging.error(f"Error retrieving top processes: {str(e)}")
+        return {"error": f"Failed to fetch top processes: {str(e)}"}
+
+# Logon history export. Rows are streamed straight from the event scan in
+# chunks, so memory stays flat however many rows are exported.
+EXPORT_CHUNK_ROWS = 5000
+EXPORT_COLUMNS = ["time", "username", "action", "logon_type", "source", "record"]
+EXPORT_FORMATS = {
+    "csv": {"mimetype": "text/csv", "extension": "csv"},
+    "parquet": {"mimetype": "application/vnd.apache.parquet", "extension": "parquet"}
+}
+
+def export_row(event):
+    return {
+        "time": event["time"].strftime('%Y-%m-%d %H:%M:%S'),
+        "username": event["username"],
+        "action": event["action"],
+        "logon_type": event["logon_type"],
+        "source": event["source"],
+        "record": event["record"]
+    }
+
+def generate_csv_export(events):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+    writer.writeheader()
+
+    for count, event in enumerate(events, 1):
+        writer.writerow(export_row(event))
+        if count % EXPORT_CHUNK_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue()
+
+class ExportSink:
+    """Write-only file object that hands written bytes back in chunks."""
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+def generate_parquet_export(events):
+    schema = pa.schema([(column, pa.int64() if column == "record" else pa.string())
+                        for column in EXPORT_COLUMNS])
+    sink = ExportSink()
+    writer = pq.ParquetWriter(sink, schema)
+
+    # One row group per chunk
+    chunk = []
+    for event in events:
+        chunk.append(export_row(event))
+        if len(chunk) == EXPORT_CHUNK_ROWS:
+            writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
+            chunk = []
+            yield sink.drain()
+
+    if chunk:
+        writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
+    writer.close()
+    yield sink.drain()
+
+# Server lifecycle. The running server records itself in a PID file and
+# stops on an authenticated /shutdown request or SIGINT/SIGTERM/SIGBREAK:
+# new requests are refused, in-flight requests and background threads get
+# until the deadline to finish, then logs are flushed and the process exits.
+LIFECYCLE_CONFIG = {
+    "host": "0.0.0.0",
+    "port": 5000,
+    "pid_file": os.path.join(os.path.dirname(os.path.abspath(__file__)), "flask_server.pid"),  # Next to the code, where server_delete.py looks
+    "shutdown_timeout": 30  # seconds
+}
+
+LIFECYCLE_STATE = {
+    "in_flight": 0,
+    "server": None,
+    "background": [],  # Threads to join before exiting
+    "stop_flag": None  # Supervisor-wide shared stop flag, in serve.py workers
+}
+lifecycle_condition = threading.Condition()
+shutdown_event = threading.Event()
+
+@app.before_request
+def track_request_start():
+    if shutdown_event.is_set():
+        return jsonify({"error": "Server is shutting down"}), 503
+    with lifecycle_condition:
+        LIFECYCLE_STATE["in_flight"] += 1
+    g.tracked_request = True
+
+@app.teardown_request
+def track_request_end(exc):
+    if g.pop("tracked_request", False):
+        with lifecycle_condition:
+            LIFECYCLE_STATE["in_flight"] -= 1
+            lifecycle_condition.notify_all()
+
+def check_credentials(username, password):
+    if not USERNAME or not HASHED_PASSWORD or not username or not password:
+        return False
+    return username == USERNAME and bcrypt.checkpw(password.encode(), HASHED_PASSWORD)
+
+PID_FILE_WRITE_GRACE = 5  # seconds an unreadable PID file is assumed to be mid-write by another server
+
+# Remove the PID file if the server that wrote it is gone. Returns False if
+# it may still belong to a live (or just starting) server.
+def remove_stale_pid_file(pid_file):
+    try:
+        with open(pid_file, "r") as file:
+            existing = json.load(file)
+        pid, create_time = existing["pid"], existing["create_time"]
+    except FileNotFoundError:
+        return True
+    except (ValueError, KeyError, TypeError):
+        # Empty or partial: another server may have created it a moment ago
         try:
-            disk = psutil.disk_usage('/')
-            disk_io = psutil.disk_io_counters()
-            stats["disk"] = {
-                "total": disk.total,
-                "used": disk.used,
-                "free": disk.free,
-                "percent": disk.percent,
-                "read_bytes": disk_io.read_bytes if disk_io else 0,
-                "write_bytes": disk_io.write_bytes if disk_io else 0
-            }
-        except Exception as e:
-            logging.error(f"Error getting disk stats: {str(e)}")
-            stats["disk"] = {"error": str(e)}
-        
-        # Network Information
+            if time.time() - os.path.getmtime(pid_file) < PID_FILE_WRITE_GRACE:
+                logging.error("PID file is being written by another server")
+                return False
+        except FileNotFoundError:
+            return True
+        logging.warning("Removing unreadable PID file")
+        pid = None
+
+    if pid is not None:
         try:
-            net_io = psutil.net_io_counters()
-            stats["network"] = {
-                "bytes_sent": net_io.bytes_sent if net_io else 0,
-                "bytes_recv": net_io.bytes_recv if net_io else 0,
-                "packets_sent": net_io.packets_sent if net_io else 0,
-                "packets_recv": net_io.packets_recv if net_io else 0
-            }
+            if psutil.Process(pid).create_time() == create_time:
+                logging.error(f"Server already running with PID {pid}")
+                return False
+        except psutil.NoSuchProcess:
+            pass
+        except psutil.AccessDenied:
+            logging.error(f"PID file belongs to PID {pid}, which cannot be inspected; assuming it is running")
+            return False
+        logging.warning(f"Removing stale PID file for PID {pid}")
+
+    try:
+        os.remove(pid_file)
+    except FileNotFoundError:
+        pass
+    return True
+
+# Create the PID file, refusing to start if another live server owns it. The
+# file is created with O_EXCL, so of two servers starting at once only one
+# gets it.
+def acquire_pid_file(host, port, workers=None):
+    pid_file = LIFECYCLE_CONFIG["pid_file"]
+    flags = os.O_CREAT | os.O_EXCL | os.O_WRONLY
+
+    try:
+        fd = os.open(pid_file, flags)
+    except FileExistsError:
+        if not remove_stale_pid_file(pid_file):
+            return False
+        try:
+            fd = os.open(pid_file, flags)
+        except FileExistsError:
+            logging.error("Another server created the PID file first")
+            return False
+
+    # How the server was started, so server_delete.py --restart can start the
+    # same mode again (workers is None for plain server.py). Only the settings
+    # are recorded; the restart command is rebuilt from them.
+    process = psutil.Process()
+    with os.fdopen(fd, "w") as file:
+        json.dump({
+            "pid": process.pid,
+            "create_time": process.create_time(),
+            "host": host,
+            "port": port,
+            "workers": workers,
+            "cwd": os.getcwd()
+        }, file)
+    return True
+
+def release_pid_file():
+    try:
+        with open(LIFECYCLE_CONFIG["pid_file"], "r") as file:
+            if json.load(file)["pid"] != os.getpid():
+                return
+        os.remove(LIFECYCLE_CONFIG["pid_file"])
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logging.error(f"Error removing PID file: {e}")
+
+def drain_and_stop(timeout):
+    deadline = time.monotonic() + timeout
+
+    # Wait for in-flight requests (including the /shutdown request itself)
+    with lifecycle_condition:
+        while LIFECYCLE_STATE["in_flight"] > 0:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logging.warning(f"Shutdown deadline reached with {LIFECYCLE_STATE['in_flight']} requests in flight")
+                break
+            lifecycle_condition.wait(remaining)
+
+    # Stop background jobs
+    background_stop.set()
+    for thread in LIFECYCLE_STATE["background"]:
+        thread.join(max(0, deadline - time.monotonic()))
+        if thread.is_alive():
+            logging.warning(f"Background thread {thread.name} did not stop before the deadline")
+
+    server = LIFECYCLE_STATE["server"]
+    if server:
+        server.shutdown()
+
+# Start a graceful shutdown in the background; returns False if one is already running
+def begin_shutdown(timeout=None, reason="request"):
+    with lifecycle_condition:
+        if shutdown_event.is_set():
+            return False
+        shutdown_event.set()
+
+    timeout = LIFECYCLE_CONFIG["shutdown_timeout"] if timeout is None else timeout
+    logging.info(f"Shutdown requested ({reason}), draining for up to {timeout} seconds")
+
+    # Release long-polling clients right away
+    with session_condition:
+        session_condition.notify_all()
+
+    threading.Thread(target=drain_and_stop, args=(timeout,), name="shutdown").start()
+    return True
+
+# Timeout passed to a shutdown request that went through the supervisor
+def get_requested_shutdown_timeout():
+    loaded = shared_state.load("shutdown")
+    return loaded[2]["timeout"] if loaded else None
+
+# Under serve.py a shutdown request stops every worker and the supervisor,
+# not just the worker that received it
+def request_shutdown(timeout=None, reason="request"):
+    stop_flag = LIFECYCLE_STATE["stop_flag"]
+    if stop_flag is None:
+        return begin_shutdown(timeout, reason)
+    if stop_flag.value:
+        return False
+
+    if timeout is not None:
+        shared_state.publish("shutdown", {"timeout": timeout})
+    logging.info(f"Shutdown requested ({reason}), stopping all workers")
+    stop_flag.value = 1
+    return True
+
+def handle_shutdown_signal(signum, frame):
+    begin_shutdown(reason=f"signal {signum}")
+
+def run_server(host=None, port=None):
+    host = host or LIFECYCLE_CONFIG["host"]
+    port = port or LIFECYCLE_CONFIG["port"]
+
+    if not acquire_pid_file(host, port):
+        print(f"Server is already running (see {LIFECYCLE_CONFIG['pid_file']})")
+        return
+
+    try:
+        server = make_server(host, port, app, threaded=True)
+        LIFECYCLE_STATE["server"] = server
+
+        for name in ("SIGINT", "SIGTERM", "SIGBREAK"):
+            if hasattr(signal, name):
+                signal.signal(getattr(signal, name), handle_shutdown_signal)
+
+        LIFECYCLE_STATE["background"].append(start_stats_sampler())
+        LIFECYCLE_STATE["background"].append(start_logon_ingester())
+
+        logging.info(f"Server started on {host}:{port} with PID {os.getpid()}")
+        server.serve_forever()
+    finally:
+        release_pid_file()
+        logging.info("Server stopped")
+        logging.shutdown()
+
+# Host jobs for serve.py. The supervisor refreshes stats, sessions and the
+# process list once per host and publishes the results for its workers; the
+# event log ingestion runs on its own thread (start_logon_ingester) so a long
+# backfill cannot hold these up. Workers fall back to collecting locally when
+# a published value is older than it should be.
+SHARED_CONFIG = {
+    "publish_interval": 1,  # seconds between stats and session publishes
+    "process_interval": 5,
+    "publish_grace": 2,  # seconds a published stat may outlive its TTL before workers collect it themselves
+    "stale_after": 15  # seconds without a sessions or process publish before workers collect them themselves
+}
+
+def publish_host_state(last_run):
+    now = time.monotonic()
+
+    # Each collector still honours its own TTL
+    for name in STATS_COLLECTORS:
+        try:
+            run_collector(name)
         except Exception as e:
-            logging.error(f"Error getting network stats: {str(e)}")
-            stats["network"] = {"error": str(e)}
-        
-        # System Information
+            logging.error(f"Error running collector {name}: {str(e)}")
+    with stats_cache_lock:
+        # Expiry moves to the wall clock, which every process shares
+        wall_offset = time.time() - time.monotonic()
+        shared_state.publish("stats_cache", {name: {"expires_at": expires_at + wall_offset, "value": value}
+                                             for name, (expires_at, value) in STATS_CACHE.items()})
+
+    # Published every cycle, changed or not, so workers can tell it is current
+    refresh_sessions()
+    with session_condition:
+        shared_state.publish("sessions", encode_sessions())
+
+    if now - last_run.get("processes", 0) >= SHARED_CONFIG["process_interval"]:
+        shared_state.publish("processes", {"processes": collect_processes()})
+        last_run["processes"] = now
+
+def run_host_jobs():
+    logging.info("Host state publisher started")
+    last_run = {}
+    while not background_stop.is_set():
         try:
-            boot_time = datetime.fromtimestamp(psutil.boot_time())
-            uptime = datetime.now() - boot_time
-            stats["system"] = {
-                "boot_time": boot_time.strftime('%Y-%m-%d %H:%M:%S'),
-                "uptime": str(uptime),
-                "process_count": len(list(psutil.process_iter()))
-            }
+            publish_host_state(last_run)
         except Exception as e:
-            logging.error(f"Error getting system stats: {str(e)}")
-            stats["system"] = {"error": str(e)}
-        
-        # Check if any critical component failed
-        if any("error" in stats[component] for component in ["cpu", "memory", "disk"]):
-            logging.error("Critical system stats collection failed")
-            return {"error": "Failed to collect critical system statistics"}
-        
-        logging.info("Successfully retrieved system statistics")
-        return stats
-        
-    except Exception as e:
-        logging.error(f"Critical error in get_system_stats: {str(e)}")
-        return {"error": f"Failed to fetch system statistics: {str(e)}"}
+            logging.error(f"Error publishing host state: {str(e)}")
+        background_stop.wait(SHARED_CONFIG["publish_interval"])
+    logging.info("Host state publisher stopped")
+
+def start_host_jobs():
+    jobs = threading.Thread(target=run_host_jobs, name="host-jobs", daemon=True)
+    jobs.start()
+    return jobs
+
+# A plain shared byte, polled: unlike a multiprocessing.Event it cannot be
+# left locked by a worker that was killed while waiting on it
+STOP_POLL_INTERVAL = 0.5  # seconds
+
+def watch_stop_flag(stop_flag):
+    while not stop_flag.value:
+        time.sleep(STOP_POLL_INTERVAL)
+    begin_shutdown(get_requested_shutdown_timeout(), reason="supervisor")
+
+# Entry point for a serve.py worker process, serving on the supervisor's socket
+def run_worker(sock, stop_flag):
+    SHARED_STATE["role"] = "worker"
+    LIFECYCLE_STATE["stop_flag"] = stop_flag
+
+    # Console signals reach the whole process group; the supervisor handles them
+    for name in ("SIGINT", "SIGBREAK"):
+        if hasattr(signal, name):
+            signal.signal(getattr(signal, name), signal.SIG_IGN)
+
+    host, port = sock.getsockname()[:2]
+    server = make_server(host, port, app, threaded=True, fd=sock.fileno())
+    LIFECYCLE_STATE["server"] = server
+    threading.Thread(target=watch_stop_flag, args=(stop_flag,), name="stop-watcher", daemon=True).start()
+
+    logging.info(f"Worker {os.getpid()} serving on {host}:{port}")
+    try:
+        server.serve_forever()
+    finally:
+        logging.info(f"Worker {os.getpid()} stopped")
+        logging.shutdown()
 
 # Routes
 @app.route("/")
@@ -298,6 +1751,43 @@ def login_logs():
     logs = get_login_history(username, days_back)
     return jsonify({"logs": logs})
 
+@app.route("/logs/summary", methods=["GET"])
+def logs_summary():
+    days = request.args.get('days', default=30, type=int)
+    username = request.args.get('username')
+    inactive_days = request.args.get('inactive_days', type=int)
+    days = max(1, min(days, ROLLUP_CONFIG["retention_days"]))
+
+    result = get_logon_summary(days, username, inactive_days)
+    if "error" in result:
+        return jsonify(result), 500
+    return jsonify(result)
+
+@app.route("/logs/export", methods=["GET"])
+def export_logs():
+    export_format = request.args.get('format', default='csv')
+    username = request.args.get('username')
+    days_back = request.args.get('days', default=365, type=int)
+
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({"error": f"Invalid format '{export_format}'. Use one of: csv, parquet"}), 400
+    if export_format == "parquet" and pq is None:
+        return jsonify({"error": "Parquet export requires pyarrow to be installed on the server"}), 501
+
+    events = iter_logon_events(username, days_back)
+    if export_format == "csv":
+        body = generate_csv_export(events)
+    else:
+        body = generate_parquet_export(events)
+
+    filename = f"logon_history_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{EXPORT_FORMATS[export_format]['extension']}"
+    logging.info(f"Exporting logon history as {export_format} ({days_back} days)")
+    return Response(
+        stream_with_context(body),
+        mimetype=EXPORT_FORMATS[export_format]["mimetype"],
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
 @app.route("/users", methods=["GET"])
 def list_users():
     return jsonify(get_users())
@@ -310,6 +1800,18 @@ def get_specific_user(username):
 def active_users():
     return jsonify(get_active_users())
 
+@app.route("/active_users/changes", methods=["GET"])
+def active_user_changes():
+    since = request.args.get('since', default=0, type=int)
+    epoch = request.args.get('epoch')
+    wait = request.args.get('wait', default=0, type=float)
+    wait = max(0, min(wait, SESSION_MAX_WAIT))
+
+    result = get_session_changes(since, wait, epoch)
+    if "error" in result:
+        return jsonify(result), 500
+    return jsonify(result)
+
 @app.route("/remove_user", methods=["POST"])
 def delete_user():
     data = request.json
@@ -322,8 +1824,15 @@ def delete_user():
 
 @app.route("/system_stats", methods=["GET"])
 def system_stats():
+    fields = request.args.get('fields')
+    if fields:
+        fields = [field.strip() for field in fields.split(",") if field.strip()]
+        invalid = [field for field in fields if field not in STATS_SECTIONS]
+        if invalid:
+            return jsonify({"error": f"Unknown fields: {', '.join(invalid)}. Use any of: {', '.join(STATS_SECTIONS)}"}), 400
+
     try:
-        stats = get_system_stats()
+        stats = get_system_stats(fields)
         if "error" in stats:
             logging.error(f"Error in system stats: {stats['error']}")
             return jsonify(stats), 500
@@ -332,6 +1841,63 @@ def system_stats():
         logging.error(f"Error in system_stats endpoint: {str(e)}")
         return jsonify({"error": f"Server error: {str(e)}"}), 500
 
+@app.route("/system_stats/history", methods=["GET"])
+def system_stats_history():
+    window = request.args.get('window', default=3600, type=int)
+    points = request.args.get('points', default=HISTORY_CONFIG["default_points"], type=int)
+    metrics = request.args.get('metrics')
+
+    if metrics:
+        metrics = [metric.strip() for metric in metrics.split(",") if metric.strip()]
+        invalid = [metric for metric in metrics if metric not in HISTORY_METRICS]
+        if invalid:
+            return jsonify({"error": f"Unknown metrics: {', '.join(invalid)}. Use any of: {', '.join(HISTORY_METRICS)}"}), 400
+    window = max(60, min(window, HISTORY_CONFIG["tiers"][-1]["retention"]))
+    points = max(3, min(points, HISTORY_CONFIG["max_points"]))
+
+    result = get_stats_history(window, points, metrics)
+    if "error" in result:
+        return jsonify(result), 500
+    return jsonify(result)
+
+@app.route("/processes/top", methods=["GET"])
+def top_processes():
+    by = request.args.get('by', default='cpu')
+    n = request.args.get('n', default=10, type=int)
+
+    if by not in TOP_PROCESS_SORT_KEYS:
+        return jsonify({"error": f"Invalid sort key '{by}'. Use one of: cpu, memory, io"}), 400
+    n = max(1, min(n, 100))
+
+    result = get_top_processes(by, n)
+    if "error" in result:
+        return jsonify(result), 500
+    return jsonify(result)
+
+@app.route("/alerts", methods=["GET"])
+def alerts():
+    since = request.args.get('since', default=0, type=int)
+    result = get_alerts(since)
+    if "error" in result:
+        return jsonify(result), 500
+    return jsonify(result)
+
+@app.route("/shutdown", methods=["POST"])
+def shutdown():
+    data = request.json or {}
+
+    if not check_credentials(data.get("username"), data.get("password")):
+        logging.warning(f"Rejected shutdown request from {request.remote_addr}")
+        return jsonify({"status": "error", "message": "Invalid credentials"}), 401
+
+    timeout = data.get("timeout")
+    if timeout is not None and (not isinstance(timeout, (int, float)) or timeout < 0):
+        return jsonify({"status": "error", "message": "Timeout must be a non-negative number of seconds"}), 400
+
+    if not request_shutdown(timeout, reason=f"request from {request.remote_addr}"):
+        return jsonify({"status": "success", "message": "Shutdown already in progress"}), 202
+    return jsonify({"status": "success", "message": "Server is shutting down", "pid": os.getpid()}), 202
+
 # Add debug endpoint to check Windows Event Log directly
 @app.route("/debug_events", methods=["GET"])
 def debug_events():
@@ -353,4 +1919,9 @@ def debug_events():
         return jsonify({"error": str(e)}), 500
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5000, debug=True)
+    parser = argparse.ArgumentParser(description="Run the API server")
+    parser.add_argument("--host", default=LIFECYCLE_CONFIG["host"])
+    parser.add_argument("--port", type=int, default=LIFECYCLE_CONFIG["port"])
+    args = parser.parse_args()
+
+    run_server(args.host, args.port)
@@ -1,25 +1,164 @@
 import os
-import signal
+import sys
+import re
+import json
+import time
+import getpass
+import argparse
+import subprocess
 import psutil
+import requests
 
-def kill_server():
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PID_FILE = os.path.join(SCRIPT_DIR, "flask_server.pid")  # Same path as LIFECYCLE_CONFIG["pid_file"] in server.py
+PID_FILE_WRITE_GRACE = 5  # seconds an unreadable PID file is assumed to be mid-write by a starting server
+SHUTDOWN_TIMEOUT = 30  # seconds
+
+# Read the PID file written by server.py; returns None if no server is running
+def read_pid_file():
+    try:
+        with open(PID_FILE, "r") as file:
+            info = json.load(file)
+        pid, create_time = info["pid"], info["create_time"]
+    except FileNotFoundError:
+        return None
+    except (ValueError, KeyError, TypeError):
+        # Empty or partial: a server may have created it a moment ago
+        try:
+            if time.time() - os.path.getmtime(PID_FILE) < PID_FILE_WRITE_GRACE:
+                sys.exit("A server is starting up; try again in a few seconds")
+        except FileNotFoundError:
+            return None
+        print("Removing unreadable PID file")
+        remove_pid_file()
+        return None
+
+    try:
+        if psutil.Process(pid).create_time() == create_time:
+            return info
+    except psutil.NoSuchProcess:
+        pass
+    except psutil.AccessDenied:
+        print(f"PID {pid} cannot be inspected; assuming it is the server")
+        return info
+
+    # The process that wrote the file is gone (or the PID was reused)
+    print(f"Removing stale PID file for PID {pid}")
+    remove_pid_file()
+    return None
+
+def remove_pid_file():
     try:
-        # Find all Python processes
-        for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-            try:
-                # Check if this is our server process
-                if proc.info['name'] == 'python.exe' and len(proc.info['cmdline']) > 1:
-                    if 'server.py' in proc.info['cmdline'][1]:
-                        print(f"Found server process with PID: {proc.info['pid']}")
-                        # Terminate the process
-                        os.kill(proc.info['pid'], signal.SIGTERM)
-                        print("Server process terminated successfully")
-                        return
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                pass
-        print("No running server process found")
+        os.remove(PID_FILE)
+    except FileNotFoundError:
+        pass
+
+HOST_PATTERN = re.compile(r"^[A-Za-z0-9:][A-Za-z0-9.:-]*$")  # Hostname or IP address; never an option
+
+def is_valid_port(port):
+    return type(port) is int and 0 < port < 65536
+
+def kill_server(info, username=None, password=None, timeout=SHUTDOWN_TIMEOUT, force=False):
+    try:
+        if not info:
+            print("No running server process found")
+            return True
+
+        print(f"Found server process with PID: {info['pid']}")
+        if not is_valid_port(info.get("port")):
+            print(f"PID file has an invalid port: {info.get('port')!r}")
+            return False
+        username = username or input("Admin username: ")
+        password = password or getpass.getpass("Admin password: ")
+
+        # Ask the server to drain in-flight requests and exit
+        response = requests.post(
+            f"http://127.0.0.1:{info['port']}/shutdown",
+            json={"username": username, "password": password, "timeout": timeout},
+            timeout=10
+        )
+        if response.status_code not in (200, 202):
+            print(f"Shutdown request rejected: {response.json().get('message', response.status_code)}")
+            return False
+
+        process = psutil.Process(info["pid"])
+        try:
+            # Allow a little extra time for logs to flush after the drain deadline
+            process.wait(timeout + 5)
+            print("Server process terminated successfully")
+            return True
+        except psutil.TimeoutExpired:
+            if not force:
+                print("Server did not stop in time; rerun with --force to terminate it")
+                return False
+            process.terminate()
+            print("Server process terminated forcibly")
+            return True
+
+    except psutil.NoSuchProcess:
+        print("Server process terminated successfully")
+        return True
+    except requests.exceptions.ConnectionError:
+        print("Could not reach the server's shutdown endpoint; rerun with --force to terminate it")
+        if force and info:
+            psutil.Process(info["pid"]).terminate()
+            print("Server process terminated forcibly")
+            return True
+        return False
     except Exception as e:
         print(f"Error terminating server: {e}")
+        return False
+
+# Command that starts the server in the mode recorded in the PID file
+# (serve.py --workers N, or plain server.py). It is rebuilt from the known
+# scripts and checked settings; nothing read from the file is run as is.
+def build_server_command(info):
+    info = info or {}
+    workers, host, port = info.get("workers"), info.get("host"), info.get("port")
+
+    if workers is None:
+        command = [sys.executable, os.path.join(SCRIPT_DIR, "server.py")]
+    elif type(workers) is int and workers >= 1:
+        command = [sys.executable, os.path.join(SCRIPT_DIR, "serve.py"), "--workers", str(workers)]
+    else:
+        raise ValueError(f"invalid worker count {workers!r}")
+
+    if host is not None:
+        if not isinstance(host, str) or not HOST_PATTERN.match(host):
+            raise ValueError(f"invalid host {host!r}")
+        command += ["--host", host]
+    if port is not None:
+        if not is_valid_port(port):
+            raise ValueError(f"invalid port {port!r}")
+        command += ["--port", str(port)]
+    return command
+
+# Start the server in the mode it was running in, or plain server.py if
+# there was no running server
+def start_server(info=None):
+    try:
+        command = build_server_command(info)
+    except ValueError as e:
+        print(f"Not restarting the server: the PID file has an {e}")
+        return
+
+    cwd = info.get("cwd") if info else None
+    if not isinstance(cwd, str) or not os.path.isdir(cwd):
+        cwd = None
+    process = subprocess.Popen(command, cwd=cwd)
+    print(f"Server started with PID: {process.pid}")
 
 if __name__ == "__main__":
-    kill_server() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Stop (or restart) the running server")
+    parser.add_argument("--username", help="Admin username (prompted if omitted)")
+    parser.add_argument("--timeout", type=float, default=SHUTDOWN_TIMEOUT,
+                        help="Seconds to wait for in-flight requests to finish")
+    parser.add_argument("--force", action="store_true",
+                        help="Terminate the process if it does not stop gracefully")
+    parser.add_argument("--restart", action="store_true", help="Start the server again once it has stopped")
+    args = parser.parse_args()
+
+    info = read_pid_file()
+    stopped = kill_server(info, args.username, timeout=args.timeout, force=args.force)
+    if args.restart and stopped:
+        start_server(info)
@@ -0,0 +1,88 @@
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+
+# Host-wide state shared between the serve.py supervisor and its workers.
+# The supervisor runs the expensive jobs (stats sampling, event log ingestion,
+# process and session refreshes) once and publishes the results here; workers
+# read them instead of repeating the work. Backed by a local SQLite file in
+# WAL mode, so readers never block the writer. Values are stored as JSON:
+# the server runs with admin rights, so nothing read back from the file may
+# be able to run code.
+STATE_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "server_state.db")
+
+_idle_connections = []
+
+# Borrow a connection for one operation. Connections are pooled rather than
+# kept per thread because the server handles every request on a new thread;
+# each one is used by a single thread at a time.
+@contextmanager
+def connection():
+    try:
+        conn = _idle_connections.pop()
+    except IndexError:
+        conn = sqlite3.connect(STATE_DB, timeout=10, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA synchronous=NORMAL")
+    try:
+        yield conn
+    finally:
+        _idle_connections.append(conn)
+
+# Create an empty store, dropping anything left over from a previous run.
+# WAL mode is stored in the database file, so it is set once here.
+def init_store():
+    with connection() as conn:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript("""
+        DROP TABLE IF EXISTS snapshots;
+        DROP TABLE IF EXISTS samples;
+        CREATE TABLE snapshots (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL,
+            updated REAL NOT NULL,
+            value TEXT NOT NULL
+        );
+        CREATE TABLE samples (
+            tier TEXT NOT NULL,
+            timestamp REAL NOT NULL,
+            value TEXT NOT NULL
+        );
+        CREATE INDEX samples_tier_timestamp ON samples (tier, timestamp);
+        """)
+
+# Replace a named snapshot; every publish bumps its version
+def publish(name, value):
+    with connection() as conn:
+        conn.execute(
+            """INSERT INTO snapshots (name, version, updated, value) VALUES (?, 1, ?, ?)
+               ON CONFLICT(name) DO UPDATE SET version = version + 1,
+                                               updated = excluded.updated,
+                                               value = excluded.value""",
+            (name, time.time(), json.dumps(value))
+        )
+
+# Return (version, updated, value) if the snapshot changed since known_version, else None
+def load(name, known_version=0):
+    with connection() as conn:
+        row = conn.execute("SELECT version FROM snapshots WHERE name = ?", (name,)).fetchone()
+        if row is None or row[0] == known_version:
+            return None
+        row = conn.execute("SELECT version, updated, value FROM snapshots WHERE name = ?", (name,)).fetchone()
+    return row[0], row[1], json.loads(row[2])
+
+# Append a point to a time series tier and drop points older than `retention` seconds
+def append_sample(tier, timestamp, value, retention):
+    with connection() as conn:
+        conn.execute("INSERT INTO samples (tier, timestamp, value) VALUES (?, ?, ?)",
+                     (tier, timestamp, json.dumps(value)))
+        conn.execute("DELETE FROM samples WHERE tier = ? AND timestamp < ?", (tier, timestamp - retention))
+
+def read_samples(tier, start):
+    with connection() as conn:
+        rows = conn.execute(
+            "SELECT timestamp, value FROM samples WHERE tier = ? AND timestamp >= ? ORDER BY timestamp",
+            (tier, start)
+        ).fetchall()
+    return [(timestamp, json.loads(value)) for timestamp, value in rows]
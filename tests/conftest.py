@@ -0,0 +1,34 @@
+import importlib
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fake_win32evtlog
+
+sys.modules["win32evtlog"] = fake_win32evtlog
+
+NOW = datetime(2026, 6, 1, 12, 0, 7)
+
+
+class FrozenDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return NOW
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    # server.py logs to (and reads credentials from) the working directory
+    monkeypatch.chdir(tmp_path)
+    module = importlib.import_module("server")
+    monkeypatch.setattr(module, "datetime", FrozenDatetime)
+
+    # Ingestion and detection state is module-level; start every test fresh
+    module.reset_logon_state()
+    module.INGEST_STATE["backfilling"] = True
+    return module
@@ -0,0 +1,116 @@
+"""Simulated win32evtlog for tests.
+
+Implements the part of the pywin32 event log API that server.py uses, over
+a synthetic log whose events are generated from their record number, so a
+log with millions of records costs no memory. Record numbers start well
+above 1, as on a Security log that has wrapped. Every ReadEventLog call
+is counted in STATS. Setting `fail_at` on a log makes the read that would
+return that record fail once, as a log that changes mid-read does.
+"""
+from datetime import timedelta
+
+EVENTLOG_SEQUENTIAL_READ = 0x0001
+EVENTLOG_SEEK_READ = 0x0002
+EVENTLOG_FORWARDS_READ = 0x0004
+EVENTLOG_BACKWARDS_READ = 0x0008
+
+BATCH_SIZE = 64  # Events returned per ReadEventLog call
+
+STATS = {"reads": 0, "seeks": 0, "records": 0}
+
+
+class Event:
+    __slots__ = ("RecordNumber", "EventID", "TimeGenerated", "StringInserts")
+
+    def __init__(self, record, event_id, time_generated, inserts):
+        self.RecordNumber = record
+        self.EventID = event_id
+        self.TimeGenerated = time_generated
+        self.StringInserts = inserts
+
+
+class SimulatedLog:
+    """`count` records starting at `first_record`, one every `interval` seconds
+    and ending at `end_time`. Every `logon_every`-th record is a 4624 logon
+    and the rest are other Security events."""
+
+    def __init__(self, first_record, count, end_time, interval=15, logon_every=1):
+        self.first_record = first_record
+        self.count = count
+        self.end_time = end_time
+        self.interval = interval
+        self.logon_every = logon_every
+        self.fail_at = None
+
+    def time_of(self, record):
+        return self.end_time - timedelta(seconds=(self.first_record + self.count - 1 - record) * self.interval)
+
+    def event_id_of(self, record):
+        return 4624 if record % self.logon_every == 0 else 4672
+
+    def event(self, record):
+        inserts = ["-"] * 20
+        inserts[5] = f"user{record % 50}"
+        inserts[8] = "2"
+        return Event(record, self.event_id_of(record), self.time_of(record), inserts)
+
+
+LOG = SimulatedLog(1, 0, None)
+
+
+def install(log):
+    global LOG
+    LOG = log
+    for key in STATS:
+        STATS[key] = 0
+
+
+class Handle:
+    def __init__(self):
+        self.next_record = None
+
+
+def OpenEventLog(server, log_type):
+    return Handle()
+
+
+def CloseEventLog(handle):
+    pass
+
+
+def GetOldestEventLogRecord(handle):
+    return LOG.first_record
+
+
+def GetNumberOfEventLogRecords(handle):
+    return LOG.count
+
+
+def ReadEventLog(handle, flags, offset):
+    STATS["reads"] += 1
+    newest = LOG.first_record + LOG.count - 1
+    forwards = bool(flags & EVENTLOG_FORWARDS_READ)
+
+    if flags & EVENTLOG_SEEK_READ:
+        STATS["seeks"] += 1
+        if not LOG.first_record <= offset <= newest:
+            raise OSError(87, "ReadEventLog", "The parameter is incorrect.")
+        record = offset
+    elif handle.next_record is None:
+        record = LOG.first_record if forwards else newest
+    else:
+        record = handle.next_record
+
+    if forwards:
+        records = range(record, min(record + BATCH_SIZE, newest + 1))
+        handle.next_record = record + len(records)
+    else:
+        records = range(record, max(record - BATCH_SIZE, LOG.first_record - 1), -1)
+        handle.next_record = record - len(records)
+
+    if LOG.fail_at in records:
+        LOG.fail_at = None
+        raise OSError(1503, "ReadEventLog", "The event log file has changed between read operations.")
+
+    STATS["records"] += len(records)
+    return [LOG.event(number) for number in records]
@@ -0,0 +1,47 @@
+import math
+from datetime import timedelta
+
+import fake_win32evtlog
+from conftest import NOW
+
+RECORD_COUNT = 2_000_000
+FIRST_RECORD = 7_340_033  # The log has wrapped; record 1 is long gone
+
+
+def brute_force_count(log, start_time):
+    return sum(1 for record in range(log.first_record, log.first_record + log.count)
+               if log.event_id_of(record) == 4624 and log.time_of(record) >= start_time)
+
+
+def test_one_day_query_reads_only_the_window(server):
+    log = fake_win32evtlog.SimulatedLog(FIRST_RECORD, RECORD_COUNT, NOW, interval=15, logon_every=3)
+    fake_win32evtlog.install(log)
+
+    events = list(server.iter_logon_events(days_back=1))
+
+    start_time = NOW - timedelta(days=1)
+    assert len(events) == brute_force_count(log, start_time)
+    assert all(event["time"] >= start_time for event in events)
+    assert [event["record"] for event in events] == sorted(event["record"] for event in events)
+
+    # O(log n) probes plus the records inside the window
+    window_records = 86400 // log.interval + 1
+    probes = math.ceil(math.log2(RECORD_COUNT)) + 1
+    assert fake_win32evtlog.STATS["seeks"] <= probes + 1
+    assert fake_win32evtlog.STATS["records"] <= window_records + (probes + 2) * fake_win32evtlog.BATCH_SIZE
+
+
+def test_window_older_than_the_log_reads_everything_once(server):
+    log = fake_win32evtlog.SimulatedLog(FIRST_RECORD, 10_000, NOW, interval=60)
+    fake_win32evtlog.install(log)
+
+    events = list(server.iter_logon_events(days_back=30))
+
+    assert len(events) == log.count
+    assert fake_win32evtlog.STATS["records"] <= log.count + (math.ceil(math.log2(log.count)) + 2) * fake_win32evtlog.BATCH_SIZE
+
+
+def test_empty_log(server):
+    fake_win32evtlog.install(fake_win32evtlog.SimulatedLog(FIRST_RECORD, 0, NOW))
+
+    assert list(server.iter_logon_events(days_back=1)) == []
@@ -0,0 +1,86 @@
+from datetime import timedelta
+
+import fake_win32evtlog
+from conftest import NOW
+
+BUSINESS_HOURS = NOW.replace(hour=10, minute=0, second=0)  # A Monday morning
+
+
+def logon_event(server, record, time, username="alice", logon_type="2", source="10.0.0.5", failed=False):
+    event_id = server.FAILED_LOGON_EVENT_ID if failed else server.LOGON_EVENT_ID
+    fields = server.LOGON_EVENT_FIELDS[event_id]
+    inserts = ["-"] * 20
+    inserts[fields["username"]] = username
+    inserts[fields["logon_type"]] = logon_type
+    inserts[fields["source"]] = source
+    return server.parse_logon_event(fake_win32evtlog.Event(record, event_id, time, inserts))
+
+
+def alerts(server, rule=None):
+    return [alert for severity in server.ALERT_SEVERITIES for alert in server.DETECTOR_STATE["alerts"][severity]
+            if rule is None or alert["rule"] == rule]
+
+
+def test_sliding_window_counter(server):
+    counter = server.SlidingWindowCounter(300, 10)
+    for second in range(5):
+        assert counter.add(second) == second + 1
+
+    # The first bucket (0-30s) has left the window
+    assert counter.add(301) == 1
+    # Events older than the window are not counted
+    assert counter.add(0) == 1
+    assert counter.add(299) == 2
+
+
+def test_brute_force_alert_raised_once_at_the_threshold(server):
+    threshold = server.DETECTION_CONFIG["user_failure_threshold"]
+    for record in range(threshold - 1):
+        server.observe_logon_event(logon_event(server, record, BUSINESS_HOURS + timedelta(seconds=record), failed=True))
+    assert alerts(server) == []
+
+    for record in range(threshold - 1, threshold + 3):
+        server.observe_logon_event(logon_event(server, record, BUSINESS_HOURS + timedelta(seconds=record), failed=True))
+
+    raised = alerts(server, "brute_force_user")
+    assert len(raised) == 1
+    assert raised[0]["severity"] == "high"
+    assert raised[0]["username"] == "alice"
+    assert alerts(server, "brute_force_source") == []
+
+
+def test_failures_spread_beyond_the_window_do_not_alert(server):
+    window = server.DETECTION_CONFIG["window"]
+    for record in range(server.DETECTION_CONFIG["user_failure_threshold"] * 2):
+        server.observe_logon_event(logon_event(server, record, BUSINESS_HOURS + timedelta(seconds=record * window), failed=True))
+
+    assert alerts(server) == []
+
+
+def test_repeated_alerts_fold_into_one(server):
+    window = server.DETECTION_CONFIG["window"]
+    for record in range(3):
+        server.observe_logon_event(logon_event(server, record, BUSINESS_HOURS + timedelta(seconds=record * 10), logon_type="10"))
+
+    raised = alerts(server, "unusual_logon_type")
+    assert len(raised) == 1
+    assert raised[0]["count"] == 3
+    assert raised[0]["last_time"] == (BUSINESS_HOURS + timedelta(seconds=20)).strftime('%Y-%m-%d %H:%M:%S')
+
+    # Another source, or the same one after the window, raises a new alert
+    server.observe_logon_event(logon_event(server, 3, BUSINESS_HOURS + timedelta(seconds=30), logon_type="10", source="10.0.0.6"))
+    server.observe_logon_event(logon_event(server, 4, BUSINESS_HOURS + timedelta(seconds=20 + window), logon_type="10"))
+    assert len(alerts(server, "unusual_logon_type")) == 3
+
+    first_id = raised[0]["id"]
+    assert [alert["id"] for alert in server.get_alerts(since=first_id)["alerts"]] == [first_id + 1, first_id + 2]
+
+
+def test_off_hours_and_machine_accounts(server):
+    night = BUSINESS_HOURS.replace(hour=2)
+    server.observe_logon_event(logon_event(server, 1, BUSINESS_HOURS))
+    server.observe_logon_event(logon_event(server, 2, night, username="HOST$"))
+    assert alerts(server) == []
+
+    server.observe_logon_event(logon_event(server, 3, night))
+    assert [alert["rule"] for alert in alerts(server)] == ["off_hours_logon"]
@@ -0,0 +1,66 @@
+from collections import Counter
+from datetime import timedelta
+
+import fake_win32evtlog
+import pytest
+from conftest import NOW
+
+FIRST_RECORD = 7_340_033
+RECORD_COUNT = 5000
+INTERVAL = 60
+
+
+def logon_count(log):
+    return sum(1 for record in range(log.first_record, log.first_record + log.count)
+               if log.event_id_of(record) == 4624)
+
+
+def rollup_total(server):
+    return sum(day["total"] for day in server.ROLLUP_STATE["days"].values())
+
+
+def alert_counts(server):
+    return Counter((alert["rule"], alert["username"]) for alerts in server.DETECTOR_STATE["alerts"].values()
+                   for alert in alerts for _ in range(alert["count"]))
+
+
+def test_backfill_retried_after_a_read_failure_counts_each_logon_once(server):
+    log = fake_win32evtlog.SimulatedLog(FIRST_RECORD, RECORD_COUNT, NOW, interval=INTERVAL)
+    fake_win32evtlog.install(log)
+    server.ingest_logon_events()
+    expected_alerts = alert_counts(server)
+    assert rollup_total(server) == logon_count(log)
+
+    server.reset_logon_state()
+    server.INGEST_STATE["backfilling"] = True
+    log.fail_at = FIRST_RECORD + RECORD_COUNT // 2
+    with pytest.raises(OSError):
+        server.ingest_logon_events()
+
+    # The partial backfill is thrown away rather than resumed on top of
+    assert server.INGEST_STATE["last_record"] is None
+    assert server.INGEST_STATE["backfilling"]
+    assert rollup_total(server) == 0
+
+    server.ingest_logon_events()
+    assert rollup_total(server) == logon_count(log)
+    assert alert_counts(server) == expected_alerts
+    assert not server.INGEST_STATE["backfilling"]
+
+
+def test_incremental_run_resumes_after_the_last_processed_record(server):
+    log = fake_win32evtlog.SimulatedLog(FIRST_RECORD, RECORD_COUNT, NOW - timedelta(seconds=1000 * INTERVAL), interval=INTERVAL)
+    fake_win32evtlog.install(log)
+    server.ingest_logon_events()
+
+    # 1000 more records arrive; reading them fails half way through
+    grown = fake_win32evtlog.SimulatedLog(FIRST_RECORD, RECORD_COUNT + 1000, NOW, interval=INTERVAL)
+    fail_at = grown.fail_at = FIRST_RECORD + RECORD_COUNT + 500
+    fake_win32evtlog.install(grown)
+    with pytest.raises(OSError):
+        server.ingest_logon_events()
+    assert FIRST_RECORD + RECORD_COUNT <= server.INGEST_STATE["last_record"] < fail_at
+
+    server.ingest_logon_events()
+    assert rollup_total(server) == logon_count(grown)
+    assert server.INGEST_STATE["last_record"] == FIRST_RECORD + RECORD_COUNT + 999
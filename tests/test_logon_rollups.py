@@ -0,0 +1,82 @@
+from collections import Counter
+from datetime import timedelta
+
+import fake_win32evtlog
+from conftest import NOW
+
+FIRST_RECORD = 7_340_033
+HOURLY = 3600
+
+
+def ingest(server, days, logon_every=2):
+    log = fake_win32evtlog.SimulatedLog(FIRST_RECORD, days * 24, NOW, interval=HOURLY, logon_every=logon_every)
+    fake_win32evtlog.install(log)
+    server.ingest_logon_events()
+    return log
+
+
+def logons_since(log, start_time):
+    return [log.event(record) for record in range(log.first_record, log.first_record + log.count)
+            if log.event_id_of(record) == 4624 and log.time_of(record) >= start_time]
+
+
+def test_summary_matches_a_scan_of_the_log(server, monkeypatch):
+    monkeypatch.setattr(server, "get_users", lambda: {"users": []})
+    log = ingest(server, days=60)
+
+    summary = server.get_logon_summary(days=30)
+
+    start_time = (NOW - timedelta(days=29)).replace(hour=0, minute=0, second=0)
+    expected = logons_since(log, start_time)
+    assert summary["total"] == len(expected)
+    assert summary["by_user"] == dict(Counter(event.StringInserts[5] for event in expected))
+    assert sum(summary["by_hour"]) == len(expected)
+    assert len(summary["by_day"]) == 30
+    assert summary["history_days"] == 59
+    assert not summary["backfilling"]
+
+
+def test_single_user_summary(server, monkeypatch):
+    monkeypatch.setattr(server, "get_users", lambda: {"users": []})
+    log = ingest(server, days=10)
+
+    summary = server.get_logon_summary(days=10, username="USER4")
+
+    start_time = (NOW - timedelta(days=9)).replace(hour=0, minute=0, second=0)
+    expected = [event for event in logons_since(log, start_time) if event.StringInserts[5] == "user4"]
+    assert summary["total"] == len(expected)
+
+
+def test_rollups_keep_the_retention_period_only(server, monkeypatch):
+    monkeypatch.setattr(server, "get_users", lambda: {"users": []})
+    ingest(server, days=400)
+
+    cutoff = (NOW - timedelta(days=server.ROLLUP_CONFIG["retention_days"])).strftime('%Y-%m-%d')
+    assert min(server.ROLLUP_STATE["days"]) >= cutoff
+    assert server.get_logon_summary(days=30)["history_days"] == server.ROLLUP_CONFIG["retention_days"]
+
+
+def test_inactive_and_unknown_accounts(server, monkeypatch):
+    # Only even-numbered users log on in the simulated log
+    monkeypatch.setattr(server, "get_users", lambda: {"users": ["USER2", "user1", "olduser"]})
+    ingest(server, days=120)
+    server.update_logon_rollups({"event_id": server.LOGON_EVENT_ID, "time": NOW - timedelta(days=100),
+                                 "username": "OldUser", "action": "Local Login"})
+
+    accounts = {account["username"]: account for account in server.get_logon_summary(days=30)["accounts"]}
+    assert accounts["USER2"]["inactive"] is False
+    assert accounts["USER2"]["days_since_logon"] == 0
+    assert accounts["olduser"]["inactive"] is True
+    assert accounts["olduser"]["days_since_logon"] == 100
+    # Never seen, and the history covers the whole threshold
+    assert accounts["user1"]["inactive"] is True
+    assert accounts["user1"]["last_logon"] is None
+
+
+def test_account_never_seen_in_a_short_history_is_unknown(server, monkeypatch):
+    monkeypatch.setattr(server, "get_users", lambda: {"users": ["user1"]})
+    ingest(server, days=30)
+
+    account = server.get_logon_summary(days=30)["accounts"][0]
+    assert account["inactive"] is None
+    assert account["days_since_logon"] is None